@@ -12,6 +12,8 @@ setup(
         'sqlalchemy>=1.4.0',
         'qrcode>=7.3.1',
         'librosa>=0.9.0',
+        'soundfile>=0.10.0',
+        'audioread>=2.1.9',
         'opencv-python>=4.7.0',
         'matplotlib>=3.5.0',
         'numpy>=1.21.0'
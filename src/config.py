@@ -1,4 +1,5 @@
 # Application configuration settings
+import os
 
 class Config:
     # Server configuration
@@ -10,5 +11,48 @@ class Config:
     SUPPORTED_FORMATS = [".mp3", ".mp4", ".wav", ".avi", ".mkv"]
     
     # Visualization settings
-    SPECTRUM_UPDATE_INTERVAL = 50  # milliseconds
-    WAVEFORM_RESOLUTION = 1000     # points
\ No newline at end of file
+    SPECTRUM_UPDATE_INTERVAL = 16  # Spectrum frame clock in milliseconds (~60 fps)
+    WAVEFORM_RESOLUTION = 4096     # Envelope points, enough for one per pixel on wide displays
+    SPECTRUM_BANDS = 64            # Log-spaced bars in the spectrum analyzer
+    SPECTRUM_SAMPLE_RATE = 44100   # Assumed until the audio format is known
+    SPECTRUM_FFT_SIZE = 2048       # Samples per analysed frame
+    SPECTRUM_HOP_SIZE = 1024       # Samples between frames (~43 spectra/s at 44.1 kHz)
+    AUDIO_QUEUE_BUFFERS = 16       # Probe buffers queued for analysis before the oldest are dropped
+    
+    # Media grid settings
+    TILE_WORKER_THREADS = max(2, (os.cpu_count() or 2) // 2)
+    VIRTUALIZED_MEDIA_GRID = True   # Model/view grid that only paints visible tiles
+    ARTWORK_CACHE_KB = 64 * 1024    # QPixmapCache budget for tile artwork
+    SEARCH_DEBOUNCE_MS = 200        # Idle time after the last keystroke before searching
+    MEDIA_GRID_COLUMNS = None       # Fixed column count, or None to fit the widget width
+    MEDIA_GRID_TILE_WIDTH = 400     # Widest tile, used to derive the column count
+    PLAYLIST_PAGE_SIZE = 200        # Playlist tracks fetched per page as the grid scrolls
+    
+    # Library scanner settings
+    SCAN_WORKERS = os.cpu_count() or 1
+    SCAN_BATCH_SIZE = 5000          # Media rows per insert transaction
+    SCAN_PROGRESS_INTERVAL_MS = 250 # Minimum time between scan progress reports
+    
+    # Library watcher settings
+    MEDIA_ROOTS = []                # Folders watched for added, changed and removed media
+    WATCH_QUIET_MS = 1000           # Apply queued changes once the folders are quiet this long
+    WATCH_MAX_DELAY_MS = 5000       # ...but never hold changes longer than this
+    WATCH_MAX_RETRIES = 3           # Retries of a batch that failed to apply before it is dropped
+    
+    # Database settings
+    DB_MMAP_SIZE = 256 * 1024 * 1024  # Bytes of the database file memory-mapped per connection
+    DB_CACHE_KB = 64 * 1024         # SQLite page cache per connection
+    DB_BUSY_TIMEOUT_MS = 5000       # Wait this long for a lock before failing
+    STATS_FLUSH_INTERVAL_MS = 2000  # Write queued play statistics at most this long after a change
+    STATS_FLUSH_THRESHOLD = 200     # ...or as soon as this many files and play events are pending
+    
+    # Listening statistics
+    LISTEN_MAX_STEP_MS = 3000       # Longer position jumps are seeks, not listening
+    LISTEN_FLUSH_SECONDS = 30       # Hand listened time to the write queue in chunks this large
+    LISTEN_MIN_EVENT_SECONDS = 1    # Shorter sessions are not logged as play events
+    STATS_TOP_N = 3                 # Entries in the most played, top rated and recent lists
+    
+    # Cache settings
+    CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "media-library-manager")
+    WAVEFORM_CACHE_DIR = os.path.join(CACHE_DIR, "waveforms")
+    WAVEFORM_CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU eviction above this size
\ No newline at end of file
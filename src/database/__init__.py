@@ -1,16 +1,58 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
+from ..config import Config
 
-DATABASE_URL = "sqlite:///media_library.db"
+DATABASE_PATH = "media_library.db"
+DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+# Read-only URI for background readers; they never take the write lock
+READ_ONLY_DATABASE_URL = f"sqlite:///file:{DATABASE_PATH}?mode=ro&uri=true"
 
+# The single read-write engine shared by the whole application
 engine = create_engine(DATABASE_URL)
+# Pool of read-only connections for worker threads (searches, statistics)
+read_engine = create_engine(READ_ONLY_DATABASE_URL)
+
+def _apply_pragmas(dbapi_connection, read_only):
+    cursor = dbapi_connection.cursor()
+    try:
+        if not read_only:
+            # WAL lets readers run while a writer commits; NORMAL only syncs at checkpoints
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        else:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.execute(f"PRAGMA mmap_size={int(Config.DB_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(Config.DB_CACHE_KB)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(Config.DB_BUSY_TIMEOUT_MS)}")
+    finally:
+        cursor.close()
+
+@event.listens_for(engine, "connect")
+def _configure_connection(dbapi_connection, connection_record):
+    _apply_pragmas(dbapi_connection, read_only=False)
+
+@event.listens_for(read_engine, "connect")
+def _configure_read_connection(dbapi_connection, connection_record):
+    _apply_pragmas(dbapi_connection, read_only=True)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+# One session per thread: every GUI component shares the GUI thread's session
+Session = scoped_session(SessionLocal)
 Base = declarative_base()
 
+def get_session():
+    """Session of the calling thread; do not close it, call Session.remove() when a thread is done"""
+    return Session()
+
+def get_read_session():
+    """New read-only session for background work; the caller closes it"""
+    return ReadSessionLocal()
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,9 +1,14 @@
-from src.database import Base, engine
+from src.database import engine
+from src.database.migrations import migrate, check_query_plans
 
 def init_database():
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    print("Database initialized successfully!")
+    # Create all tables and apply pending schema migrations
+    version = migrate(engine)
+    print(f"Database initialized successfully! (schema version {version})")
+    
+    # Make sure the hot statistics queries are still served by indexes
+    for name, plan in check_query_plans(engine).items():
+        print(f"Warning: query '{name}' is not using an index: {'; '.join(plan)}")
 
 if __name__ == '__main__':
     init_database()
\ No newline at end of file
@@ -1,12 +1,13 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from .models import Base
+from . import engine, Session
+from .migrations import migrate
 
 class DatabaseManager:
     def __init__(self):
-        self.engine = create_engine('sqlite:///media_library.db')
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+        # Share the application engine instead of opening a second one
+        self.engine = engine
+        # Create missing tables and upgrade older database files in place
+        migrate(self.engine)
+        self.Session = Session
     
     def get_session(self):
-        return self.Session()
\ No newline at end of file
+        return self.Session()
@@ -0,0 +1,165 @@
+from sqlalchemy import text, select, func
+from . import Base
+from .models import Media
+
+# Versioned schema migrations, applied in order on top of create_all().
+# The current version is stored in SQLite's PRAGMA user_version. Each
+# migration must be idempotent: create_all() already builds missing tables
+# from the current models, so a fresh database runs them as no-ops.
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register a migration function for the given schema version"""
+    def register(upgrade):
+        MIGRATIONS.append((version, description, upgrade))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return upgrade
+    return register
+
+def get_schema_version(connection):
+    return connection.execute(text("PRAGMA user_version")).scalar() or 0
+
+def set_schema_version(connection, version):
+    # PRAGMA does not accept bound parameters
+    connection.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+def latest_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+def migrate(engine):
+    """Create missing tables and upgrade an existing database file in place"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        current = get_schema_version(connection)
+        for version, description, upgrade in MIGRATIONS:
+            if version <= current:
+                continue
+            print(f"Applying database migration {version}: {description}")
+            upgrade(connection)
+            set_schema_version(connection, version)
+            current = version
+    return current
+
+@migration(1, "Index play_count, last_played, rating and is_favorite")
+def _add_statistics_indexes(connection):
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_media_play_count ON media (play_count DESC, id)"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_media_last_played ON media (last_played DESC)"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_media_rating ON media (rating DESC)"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_media_favorite ON media (is_favorite, last_played DESC)"))
+    connection.execute(text("ANALYZE media"))
+
+# Hot queries issued by StatisticsPanel and Sidebar; each must be served by an index
+HOT_QUERIES = {
+    'most_played': select(Media).order_by(Media.play_count.desc()).limit(3),
+    'recent_media': select(Media).order_by(Media.last_played.desc()).limit(10),
+    'recent_plays': select(Media).filter(Media.last_played.isnot(None))
+                                 .order_by(Media.last_played.desc()).limit(3),
+    'favorites': select(Media).filter(Media.is_favorite == True),
+    'average_rating': select(func.avg(Media.rating)).filter(Media.rating > 0),
+    'top_rated': select(Media).filter(Media.rating > 0).order_by(Media.rating.desc()).limit(3),
+}
+
+def explain_query_plan(connection, statement):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement"""
+    compiled = statement.compile(dialect=connection.dialect)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params.values()))
+    return [row[-1] for row in rows]
+
+def check_query_plans(engine, queries=None):
+    """Return {name: plan} for hot queries that fall back to a full scan or temp sort"""
+    regressions = {}
+    with engine.connect() as connection:
+        for name, statement in (queries or HOT_QUERIES).items():
+            plan = explain_query_plan(connection, statement)
+            full_scan = any(detail.startswith('SCAN') and 'USING' not in detail for detail in plan)
+            temp_sort = any('USE TEMP B-TREE' in detail for detail in plan)
+            if full_scan or temp_sort:
+                regressions[name] = plan
+    return regressions
+
+# Full-text row of a media item, aggregated from media, tags and categories
+_FTS_ROW_SELECT = """
+    SELECT m.id, m.title, m.artist, m.album,
+           (SELECT group_concat(t.name, ' ') FROM media_tags mt JOIN tags t ON t.id = mt.tag_id
+             WHERE mt.media_id = m.id),
+           (SELECT group_concat(c.name, ' ') FROM media_categories mc JOIN categories c ON c.id = mc.category_id
+             WHERE mc.media_id = m.id),
+           m.comment
+      FROM media m
+"""
+_FTS_COLUMNS = "rowid, title, artist, album, tags, categories, comment"
+
+def _fts_refresh(match):
+    """Trigger body that rebuilds the full-text rows of the media ids matching `match`"""
+    return (f"DELETE FROM media_fts WHERE rowid {match}; "
+            f"INSERT INTO media_fts ({_FTS_COLUMNS}) {_FTS_ROW_SELECT} WHERE m.id {match};")
+
+def fts5_available(connection):
+    return bool(connection.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar())
+
+@migration(2, "Full-text search index over media, tags and categories")
+def _add_search_index(connection):
+    if not fts5_available(connection):
+        print("SQLite was built without FTS5; search falls back to LIKE queries")
+        return
+
+    connection.execute(text("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS media_fts USING fts5(
+            title, artist, album, tags, categories, comment,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """))
+
+    triggers = {
+        'media_fts_insert': ("AFTER INSERT ON media", _fts_refresh("= NEW.id")),
+        'media_fts_update': ("AFTER UPDATE OF title, artist, album, comment ON media", _fts_refresh("= NEW.id")),
+        'media_fts_delete': ("AFTER DELETE ON media", "DELETE FROM media_fts WHERE rowid = OLD.id;"),
+    }
+
+    # Tag and category links change the aggregated text of the linked media row
+    for link_table in ('media_tags', 'media_categories'):
+        triggers[f"{link_table}_fts_insert"] = (f"AFTER INSERT ON {link_table}", _fts_refresh("= NEW.media_id"))
+        triggers[f"{link_table}_fts_delete"] = (f"AFTER DELETE ON {link_table}", _fts_refresh("= OLD.media_id"))
+
+    # Renaming or deleting a tag/category changes every media row linked to it
+    for table, link_table, key in (('tags', 'media_tags', 'tag_id'),
+                                   ('categories', 'media_categories', 'category_id')):
+        for name, event, row in (('update', 'UPDATE OF name', 'NEW'), ('delete', 'DELETE', 'OLD')):
+            match = f"IN (SELECT media_id FROM {link_table} WHERE {key} = {row}.id)"
+            triggers[f"{table}_fts_{name}"] = (f"AFTER {event} ON {table}", _fts_refresh(match))
+
+    for name, (event, body) in triggers.items():
+        connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END"))
+
+    # Index the rows that already exist
+    connection.execute(text("DELETE FROM media_fts"))
+    connection.execute(text(f"INSERT INTO media_fts ({_FTS_COLUMNS}) {_FTS_ROW_SELECT}"))
+
+
+def _column_names(connection, table):
+    return {row[1] for row in connection.execute(text(f"PRAGMA table_info({table})"))}
+
+@migration(3, "File fingerprint columns for incremental rescans")
+def _add_file_fingerprints(connection):
+    existing = _column_names(connection, 'media')
+    for name, definition in (('file_size', 'INTEGER'),
+                             ('file_mtime_ns', 'INTEGER'),
+                             ('file_inode', 'INTEGER'),
+                             ('is_missing', 'BOOLEAN NOT NULL DEFAULT 0')):
+        if name not in existing:
+            connection.execute(text(f"ALTER TABLE media ADD COLUMN {name} {definition}"))
+
+@migration(4, "Play event log for time-windowed listening statistics")
+def _add_play_events(connection):
+    # create_all() builds the table; older files only need the indexes checked
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_play_events_started_at ON play_events (started_at)"))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_play_events_media_started_at ON play_events (media_id, started_at)"
+    ))
+
+@migration(5, "Index playlist items by playlist and position")
+def _add_playlist_order_index(connection):
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_playlist_items_order ON playlist_items (playlist_id, position, id)"
+    ))
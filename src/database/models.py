@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Table, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Table, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from . import Base
 
@@ -38,10 +38,43 @@ class Media(Base):
     total_play_time = Column(Float, default=0)  # Total time spent playing this media in seconds
     comment = Column(String, nullable=True)  # User comments on media
     
+    # File fingerprint from the last scan; unchanged files are not re-parsed on rescan
+    file_size = Column(Integer, nullable=True)
+    file_mtime_ns = Column(Integer, nullable=True)
+    file_inode = Column(Integer, nullable=True)
+    is_missing = Column(Boolean, default=False)  # File was not found by the last scan
+    
     # Relationships
     tags = relationship('Tag', secondary=media_tags, back_populates='media')
     categories = relationship('Category', secondary=media_categories, back_populates='media_items')
     playlists = relationship('Playlist', secondary=playlist_media, back_populates='media_items')
+    
+    # Indexes for the statistics, recent and favorites queries (see migrations.py)
+    __table_args__ = (
+        Index('ix_media_play_count', play_count.desc(), id),
+        Index('ix_media_last_played', last_played.desc()),
+        Index('ix_media_rating', rating.desc()),
+        Index('ix_media_favorite', is_favorite, last_played.desc()),
+    )
+
+class PlayEvent(Base):
+    """One listening session of a media item, for time-windowed statistics"""
+    __tablename__ = 'play_events'
+    
+    id = Column(Integer, primary_key=True)
+    media_id = Column(Integer, ForeignKey('media.id', ondelete='CASCADE'), nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    ended_at = Column(DateTime, nullable=False)
+    seconds = Column(Float, nullable=False)  # Time actually listened, excluding pauses and skips
+    
+    # Relationships
+    media = relationship('Media', backref='play_events')
+    
+    # Time-window queries, overall and per media item (see migrations.py)
+    __table_args__ = (
+        Index('ix_play_events_started_at', started_at),
+        Index('ix_play_events_media_started_at', media_id, started_at),
+    )
 
 class PlaylistItem(Base):
     __tablename__ = 'playlist_items'
@@ -54,6 +87,11 @@ class PlaylistItem(Base):
     # Relationships
     media = relationship('Media', backref='playlist_items')
     playlist = relationship('Playlist', backref='items')
+    
+    # Ordered playlist reads (see migrations.py)
+    __table_args__ = (
+        Index('ix_playlist_items_order', playlist_id, position, id),
+    )
 
 class Tag(Base):
     __tablename__ = 'tags'
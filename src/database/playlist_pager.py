@@ -0,0 +1,69 @@
+from sqlalchemy import and_, or_
+from ..config import Config
+from . import get_read_session
+from .models import Media, PlaylistItem
+
+class PlaylistPager:
+    """Read a playlist's tracks page by page, in playlist order.
+
+    Tracks are ordered by position with ties in insertion order, followed
+    by tracks that have no position, in insertion order (ORDER BY position
+    IS NULL, position, id). Pages are read with a keyset on (position, id)
+    so every query is a range scan of the (playlist_id, position, id)
+    index instead of an OFFSET over all earlier rows. Only the columns a
+    grid tile shows are loaded; no ORM objects are built.
+    """
+
+    def __init__(self, playlist_id, page_size=None):
+        self.playlist_id = playlist_id
+        self.page_size = page_size or Config.PLAYLIST_PAGE_SIZE
+        self.after = None  # (position, id) of the last row returned
+        self.unpositioned = False  # Positioned rows are done; reading the ones without a position
+        self.exhausted = False
+
+    def _query(self, db, limit):
+        query = db.query(Media.file_path, Media.title, Media.artist, Media.album,
+                         PlaylistItem.position, PlaylistItem.id) \
+            .join(PlaylistItem, PlaylistItem.media_id == Media.id) \
+            .filter(PlaylistItem.playlist_id == self.playlist_id)
+        if self.unpositioned:
+            query = query.filter(PlaylistItem.position.is_(None))
+            if self.after is not None:
+                query = query.filter(PlaylistItem.id > self.after[1])
+            query = query.order_by(PlaylistItem.id)
+        else:
+            query = query.filter(PlaylistItem.position.isnot(None))
+            if self.after is not None:
+                position, item_id = self.after
+                query = query.filter(PlaylistItem.position >= position, or_(
+                    PlaylistItem.position > position,
+                    and_(PlaylistItem.position == position, PlaylistItem.id > item_id),
+                ))
+            query = query.order_by(PlaylistItem.position, PlaylistItem.id)
+        return query.limit(limit).all()
+
+    def next_page(self):
+        """Return the next [{'file_path', 'title', 'artist', 'album'}] page; [] once exhausted"""
+        if self.exhausted:
+            return []
+        rows = []
+        db = get_read_session()
+        try:
+            while len(rows) < self.page_size:
+                batch = self._query(db, self.page_size - len(rows))
+                rows.extend(batch)
+                if batch:
+                    self.after = (batch[-1][4], batch[-1][5])
+                if len(rows) < self.page_size:
+                    if self.unpositioned:
+                        self.exhausted = True
+                        break
+                    # Positioned rows ran out: continue the page with the unpositioned ones
+                    self.unpositioned = True
+                    self.after = None
+        finally:
+            db.close()
+        return [
+            {'file_path': file_path, 'title': title, 'artist': artist, 'album': album}
+            for file_path, title, artist, album, _, _ in rows
+        ]
@@ -0,0 +1,149 @@
+import re
+import unicodedata
+from sqlalchemy import text, or_
+from .models import Media, Tag, Category
+
+class MediaSearchIndex:
+    """Ranked prefix search over the media_fts full-text index.
+
+    The index is kept in sync with media, tags and categories by triggers
+    (see migrations.py). When SQLite lacks FTS5 the search falls back to
+    LIKE queries with the same filter semantics.
+    """
+    # SearchPanel filter type -> FTS column (None searches every column)
+    COLUMNS = {
+        'all': None,
+        'title': 'title',
+        'artist': 'artist',
+        'album': 'album',
+        'tag': 'tags',
+        'category': 'categories',
+        'comment': 'comment',
+    }
+    _fts_available = None
+
+    @staticmethod
+    def tokenize(search_text):
+        """Lower-case word tokens with diacritics removed, like the unicode61 tokenizer"""
+        decomposed = unicodedata.normalize('NFKD', search_text.lower())
+        return re.findall(r'\w+', ''.join(char for char in decomposed if not unicodedata.combining(char)))
+
+    @staticmethod
+    def build_match_query(search_text, filter_type='all'):
+        """Build an FTS5 MATCH expression where every token is a prefix match"""
+        tokens = MediaSearchIndex.tokenize(search_text)
+        if not tokens:
+            return None
+        column = MediaSearchIndex.COLUMNS.get(filter_type)
+        scope = f"{column} : " if column else ""
+        # Quoting each token keeps FTS5 operators typed by the user from being interpreted
+        return ' '.join(f'{scope}"{token}"*' for token in tokens)
+
+    @staticmethod
+    def has_fts(session):
+        if MediaSearchIndex._fts_available is None:
+            MediaSearchIndex._fts_available = session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'media_fts'"
+            )).first() is not None
+        return MediaSearchIndex._fts_available
+
+    @staticmethod
+    def search(session, search_text, filter_type='all', limit=None, ranked=True):
+        """Return file paths matching a query, or None when nothing filters
+
+        Results are ordered by bm25 relevance unless ranked is False, which
+        skips the sort for callers that only need the matching set.
+        Favorites ignore the search text, as in the original grid filter.
+        """
+        if filter_type == 'favorite':
+            return [path for (path,) in session.query(Media.file_path).filter(Media.is_favorite == True)]
+        if filter_type not in MediaSearchIndex.COLUMNS:
+            filter_type = 'all'
+
+        match_query = MediaSearchIndex.build_match_query(search_text, filter_type)
+        if match_query is None:
+            return None
+
+        if not MediaSearchIndex.has_fts(session):
+            return MediaSearchIndex._search_like(session, search_text, filter_type, limit)
+
+        sql = """
+            SELECT media.file_path
+              FROM media_fts JOIN media ON media.id = media_fts.rowid
+             WHERE media_fts MATCH :query
+        """
+        if ranked:
+            sql += " ORDER BY media_fts.rank"
+        params = {'query': match_query}
+        if limit:
+            sql += " LIMIT :limit"
+            params['limit'] = limit
+        return [path for (path,) in session.execute(text(sql), params)]
+
+    @staticmethod
+    def _search_like(session, search_text, filter_type, limit):
+        query = session.query(Media.file_path)
+        for token in MediaSearchIndex.tokenize(search_text):
+            pattern = f"%{token}%"
+            conditions = []
+            if filter_type in ('all', 'title'):
+                conditions.append(Media.title.ilike(pattern))
+            if filter_type in ('all', 'artist'):
+                conditions.append(Media.artist.ilike(pattern))
+            if filter_type in ('all', 'album'):
+                conditions.append(Media.album.ilike(pattern))
+            if filter_type in ('all', 'comment'):
+                conditions.append(Media.comment.ilike(pattern))
+            if filter_type in ('all', 'tag'):
+                conditions.append(Media.tags.any(Tag.name.ilike(pattern)))
+            if filter_type in ('all', 'category'):
+                conditions.append(Media.categories.any(Category.name.ilike(pattern)))
+            query = query.filter(or_(*conditions))
+        if limit:
+            query = query.limit(limit)
+        return [path for (path,) in query]
+
+    @staticmethod
+    def indexed_paths(session):
+        """All file paths known to the database"""
+        return {path for (path,) in session.query(Media.file_path)}
+
+    @staticmethod
+    def search_texts(session, search_text, filter_type='all'):
+        """Like search(), but return {file_path: {column: words}} for in-memory refinement"""
+        match_query = MediaSearchIndex.build_match_query(search_text, filter_type)
+        if match_query is None or not MediaSearchIndex.has_fts(session):
+            return None
+        rows = session.execute(text("""
+            SELECT media.file_path, media_fts.title, media_fts.artist, media_fts.album,
+                   media_fts.tags, media_fts.categories, media_fts.comment
+              FROM media_fts JOIN media ON media.id = media_fts.rowid
+             WHERE media_fts MATCH :query
+        """), {'query': match_query})
+        columns = ('title', 'artist', 'album', 'tags', 'categories', 'comment')
+        return {
+            row[0]: {column: MediaSearchIndex.tokenize(value) for column, value in zip(columns, row[1:]) if value}
+            for row in rows
+        }
+
+    @staticmethod
+    def match_words(words, search_text, filter_type='all'):
+        """Check {column: words} against a query with the same prefix semantics as FTS"""
+        column = MediaSearchIndex.COLUMNS.get(filter_type)
+        if column is not None:
+            candidates = words.get(column, ())
+        else:
+            candidates = [word for column_words in words.values() for word in column_words]
+        return all(any(word.startswith(token) for word in candidates)
+                   for token in MediaSearchIndex.tokenize(search_text))
+
+    @staticmethod
+    def metadata_words(metadata):
+        """{column: words} for the title, artist and album of a metadata dict"""
+        return {field: MediaSearchIndex.tokenize(str(metadata[field]))
+                for field in ('title', 'artist', 'album') if metadata.get(field)}
+
+    @staticmethod
+    def match_metadata(metadata, search_text, filter_type='all'):
+        """In-memory prefix match for media that is not in the database yet"""
+        return MediaSearchIndex.match_words(MediaSearchIndex.metadata_words(metadata), search_text, filter_type)
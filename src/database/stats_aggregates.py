@@ -0,0 +1,219 @@
+import heapq
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from ..config import Config
+from . import get_read_session
+from .models import Media
+from .stats_writer import get_stats_writer
+
+class StatsAggregateStore(QObject):
+    """In-memory library statistics kept current by the stats write queue.
+
+    reload() reads the statistics columns of every Media row once; after
+    that each change queued on StatsWriteQueue is applied incrementally,
+    so totals, the average rating, top-N lists and recent plays are
+    served without touching the database. Listeners receive the names of
+    the sections that changed (see SECTIONS) through sections_changed,
+    coalesced to one emission per event-loop pass. With a writer, reload()
+    flushes it first so no queued change is lost by the rebuild.
+    """
+    sections_changed = pyqtSignal(set)
+
+    TOTAL_TRACKS = 'total_tracks'
+    MOST_PLAYED = 'most_played'
+    FAVORITES = 'favorites'
+    PLAY_TIME = 'play_time'
+    RECENT_PLAYS = 'recent_plays'
+    RATINGS = 'ratings'
+    COMMENTS = 'comments'
+    SECTIONS = frozenset((TOTAL_TRACKS, MOST_PLAYED, FAVORITES, PLAY_TIME, RECENT_PLAYS, RATINGS, COMMENTS))
+
+    def __init__(self, top_n=None, writer=None, parent=None):
+        super().__init__(parent)
+        self.top_n = top_n or Config.STATS_TOP_N
+        self.writer = writer  # StatsWriteQueue whose changes this store follows
+        self._rows = {}  # file_path -> {'title', 'play_count', 'rating', 'is_favorite', 'last_played'}
+        self._dirty = set()
+        self._notify_timer = QTimer(self)
+        self._notify_timer.setSingleShot(True)
+        self._notify_timer.setInterval(0)
+        self._notify_timer.timeout.connect(self._notify)
+        self._reset()
+
+    def _reset(self):
+        self.total_play_time = 0.0
+        self._rating_sum = 0
+        self._rating_count = 0
+        self._favorites = {}  # file_path -> title, in insertion order
+        self._most_played = []  # file paths, highest play_count first
+        self._top_rated = []  # file paths, highest rating first
+        self._recent = []  # file paths, most recently played first
+        self._comments = []  # (title, comment)
+
+    def reload(self):
+        """Rebuild every aggregate from the database and mark all sections changed"""
+        if self.writer is not None:
+            # Changes already applied here but not written yet would vanish from the rebuild
+            self.writer.flush()
+        db = get_read_session()
+        try:
+            rows = db.query(Media.file_path, Media.title, Media.play_count, Media.rating,
+                            Media.is_favorite, Media.last_played, Media.total_play_time, Media.comment).all()
+        except Exception as e:
+            print(f"Error loading statistics: {str(e)}")
+            return
+        finally:
+            db.close()
+
+        self._rows = {}
+        self._reset()
+        comments = []
+        for file_path, title, play_count, rating, is_favorite, last_played, total_play_time, comment in rows:
+            self._rows[file_path] = {
+                'title': title or file_path,
+                'play_count': play_count or 0,
+                'rating': rating or 0,
+                'is_favorite': bool(is_favorite),
+                'last_played': last_played,
+            }
+            self.total_play_time += total_play_time or 0
+            if rating and rating > 0:
+                self._rating_sum += rating
+                self._rating_count += 1
+            if is_favorite:
+                self._favorites[file_path] = title or file_path
+            if comment is not None and len(comments) < self.top_n:
+                comments.append((title or file_path, comment))
+        self._comments = comments
+        self._most_played = self._top('play_count')
+        self._top_rated = self._top('rating', rated_only=True)
+        self._recent = heapq.nlargest(
+            self.top_n, (path for path, row in self._rows.items() if row['last_played'] is not None),
+            key=lambda path: self._rows[path]['last_played'])
+        if self.writer is not None:
+            # Left over only if the flush failed; they are still on their way to the database
+            for file_path, change in self.writer.pending_changes().items():
+                self.apply(file_path, change)
+        self._mark(self.SECTIONS)
+
+    def _top(self, key, rated_only=False):
+        """Recompute a top-N list from all rows; only needed when a member's value drops"""
+        candidates = (path for path, row in self._rows.items() if not rated_only or row[key] > 0)
+        return heapq.nlargest(self.top_n, candidates, key=lambda path: self._rows[path][key])
+
+    def _raise_in_top(self, top, file_path, key):
+        """Place a file whose value just increased into a top-N list; True if the list changed"""
+        value = self._rows[file_path][key]
+        if file_path not in top:
+            if len(top) >= self.top_n and value <= self._rows[top[-1]][key]:
+                return False
+            top.append(file_path)
+        top.sort(key=lambda path: self._rows[path][key], reverse=True)
+        del top[self.top_n:]
+        return True
+
+    def apply(self, file_path, change):
+        """Fold one queued change (see StatsWriteQueue.stats_queued) into the aggregates"""
+        row = self._rows.get(file_path)
+        if row is None:
+            return  # Not in the library
+        changed = set()
+
+        if change.get('plays'):
+            row['play_count'] += change['plays']
+            if self._raise_in_top(self._most_played, file_path, 'play_count'):
+                changed.add(self.MOST_PLAYED)
+
+        if change.get('play_time'):
+            self.total_play_time += change['play_time']
+            changed.add(self.PLAY_TIME)
+
+        if 'last_played' in change:
+            row['last_played'] = change['last_played']
+            if file_path in self._recent:
+                self._recent.remove(file_path)
+            self._recent.insert(0, file_path)
+            del self._recent[self.top_n:]
+            changed.add(self.RECENT_PLAYS)
+
+        if 'rating' in change:
+            old, new = row['rating'], change['rating'] or 0
+            if old != new:
+                row['rating'] = new
+                if old > 0:
+                    self._rating_sum -= old
+                    self._rating_count -= 1
+                if new > 0:
+                    self._rating_sum += new
+                    self._rating_count += 1
+                if new < old and file_path in self._top_rated:
+                    self._top_rated = self._top('rating', rated_only=True)
+                elif new > old:
+                    self._raise_in_top(self._top_rated, file_path, 'rating')
+                changed.add(self.RATINGS)
+
+        if 'is_favorite' in change and change['is_favorite'] != row['is_favorite']:
+            row['is_favorite'] = change['is_favorite']
+            if row['is_favorite']:
+                self._favorites[file_path] = row['title']
+            else:
+                self._favorites.pop(file_path, None)
+            changed.add(self.FAVORITES)
+
+        self._mark(changed)
+
+    def _mark(self, sections):
+        if sections:
+            self._dirty |= sections
+            self._notify_timer.start()
+
+    def _notify(self):
+        sections, self._dirty = self._dirty, set()
+        self.sections_changed.emit(sections)
+
+    def _titled(self, paths, key):
+        return [(self._rows[path]['title'], self._rows[path][key]) for path in paths]
+
+    def total_tracks(self):
+        return len(self._rows)
+
+    def average_rating(self):
+        return self._rating_sum / self._rating_count if self._rating_count else 0.0
+
+    def most_played(self):
+        """[(title, play_count)] of the top-N played tracks"""
+        return self._titled(self._most_played, 'play_count')
+
+    def top_rated(self):
+        """[(title, rating)] of the top-N rated tracks"""
+        return self._titled(self._top_rated, 'rating')
+
+    def recent_plays(self):
+        """[(title, last_played)] of the most recently played tracks"""
+        return self._titled(self._recent, 'last_played')
+
+    def favorites(self):
+        """[title] of every favorite track"""
+        return list(self._favorites.values())
+
+    def favorite_count(self):
+        return len(self._favorites)
+
+    def comments(self):
+        return list(self._comments)
+
+_stats_aggregates = None
+
+def get_stats_aggregates():
+    """The shared aggregate store, loaded and subscribed to the write queue on first use"""
+    global _stats_aggregates
+    if _stats_aggregates is None:
+        writer = get_stats_writer()
+        _stats_aggregates = StatsAggregateStore(writer=writer)
+        _stats_aggregates.reload()
+        writer.stats_queued.connect(_stats_aggregates.apply)
+    return _stats_aggregates
+
+def reload_stats_aggregates():
+    """Reload the shared store after library changes, if anything uses it"""
+    if _stats_aggregates is not None:
+        _stats_aggregates.reload()
@@ -0,0 +1,223 @@
+import atexit
+import threading
+import time
+from datetime import datetime
+from PyQt5.QtCore import QObject, pyqtSignal
+from sqlalchemy import bindparam, func, select, DateTime, Float
+from ..config import Config
+from . import SessionLocal
+from .models import Media, PlayEvent
+
+class StatsWriteQueue(QObject):
+    """Write-behind queue for play statistics, ratings, favorites and play events.
+
+    Mutations are merged per file path in memory (play counts and play
+    time add up, the last rating/favorite/last_played wins) and play
+    events are appended to a log. Both are written by a background thread
+    in one transaction once Config.STATS_FLUSH_INTERVAL_MS has passed
+    since the first pending change or Config.STATS_FLUSH_THRESHOLD files
+    and events are pending. stop() writes whatever is left. Callers never
+    wait for the database.
+    """
+    flushed = pyqtSignal(list)  # file paths whose statistics the last flush wrote
+    stats_queued = pyqtSignal(str, dict)  # file path, the change just queued for it
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending = {}  # file_path -> merged changes, guarded by _condition
+        self._events = []  # (file_path, started_at, ended_at, seconds), guarded by _condition
+        self._first_change = None
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="StatsWriteQueue", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the writer thread and flush every pending change"""
+        if self._thread is not None:
+            with self._condition:
+                self._stopping = True
+                self._condition.notify()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _entry(self, file_path):
+        entry = self._pending.get(file_path)
+        if entry is None:
+            entry = self._pending[file_path] = {'plays': 0, 'play_time': 0.0}
+            self._changed()
+        return entry
+
+    def _changed(self):
+        if self._first_change is None:
+            # Wake the writer so it starts the flush countdown
+            self._first_change = time.monotonic()
+            self._condition.notify()
+        elif self._pending_size() >= Config.STATS_FLUSH_THRESHOLD:
+            self._condition.notify()
+
+    def _pending_size(self):
+        return len(self._pending) + len(self._events)
+
+    def record_play(self, file_path, played_at=None):
+        """Count one play and stamp last_played"""
+        played_at = played_at or datetime.now()
+        with self._condition:
+            entry = self._entry(file_path)
+            entry['plays'] += 1
+            entry['last_played'] = played_at
+        self.stats_queued.emit(file_path, {'plays': 1, 'last_played': played_at})
+
+    def add_play_time(self, file_path, seconds):
+        if seconds > 0:
+            with self._condition:
+                self._entry(file_path)['play_time'] += seconds
+            self.stats_queued.emit(file_path, {'play_time': seconds})
+
+    def update_last_played(self, file_path, played_at=None):
+        played_at = played_at or datetime.now()
+        with self._condition:
+            self._entry(file_path)['last_played'] = played_at
+        self.stats_queued.emit(file_path, {'last_played': played_at})
+
+    def set_rating(self, file_path, rating):
+        with self._condition:
+            self._entry(file_path)['rating'] = rating
+        self.stats_queued.emit(file_path, {'rating': rating})
+
+    def set_favorite(self, file_path, is_favorite):
+        with self._condition:
+            self._entry(file_path)['is_favorite'] = bool(is_favorite)
+        self.stats_queued.emit(file_path, {'is_favorite': bool(is_favorite)})
+
+    def record_play_event(self, file_path, started_at, ended_at, seconds):
+        """Log one listening session; its seconds are not added to total_play_time here"""
+        with self._condition:
+            self._events.append((file_path, started_at, ended_at, seconds))
+            self._changed()
+
+    def pending_count(self):
+        with self._condition:
+            return self._pending_size()
+
+    def pending_changes(self):
+        """{file_path: merged change} not written yet, in the form stats_queued emits"""
+        with self._condition:
+            return {file_path: dict(entry) for file_path, entry in self._pending.items()}
+
+    def _take(self):
+        with self._condition:
+            pending, events = self._pending, self._events
+            self._pending, self._events = {}, []
+            self._first_change = None
+            return pending, events
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopping:
+                        return
+                    if self._first_change is not None:
+                        wait = self._first_change + Config.STATS_FLUSH_INTERVAL_MS / 1000 - time.monotonic()
+                        if wait <= 0 or self._pending_size() >= Config.STATS_FLUSH_THRESHOLD:
+                            break
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+            self.flush()
+
+    def flush(self):
+        """Write all pending changes in one transaction; returns the number of changes written"""
+        with self._flush_lock:
+            pending, events = self._take()
+            if not pending and not events:
+                return 0
+            try:
+                self._write(pending, events)
+            except Exception as e:
+                print(f"Error writing play statistics: {str(e)}")
+                self._requeue(pending, events)
+                return 0
+        if pending:
+            self.flushed.emit(list(pending))
+        return len(pending) + len(events)
+
+    def _requeue(self, pending, events):
+        """Merge a failed batch back under any changes made since, for the next flush"""
+        with self._condition:
+            self._events[:0] = events
+            if events:
+                self._changed()
+            for file_path, old in pending.items():
+                entry = self._entry(file_path)
+                entry['plays'] += old['plays']
+                entry['play_time'] += old['play_time']
+                for key in ('last_played', 'rating', 'is_favorite'):
+                    if key in old:
+                        entry.setdefault(key, old[key])
+
+    @staticmethod
+    def _write(pending, events):
+        table = Media.__table__
+        by_path = table.c.file_path == bindparam('b_file_path')
+        counters, last_played, ratings, favorites = [], [], [], []
+        for file_path, entry in pending.items():
+            if entry['plays'] or entry['play_time']:
+                counters.append({'b_file_path': file_path, 'b_plays': entry['plays'],
+                                 'b_play_time': entry['play_time']})
+            if 'last_played' in entry:
+                last_played.append({'b_file_path': file_path, 'b_last_played': entry['last_played']})
+            if 'rating' in entry:
+                ratings.append({'b_file_path': file_path, 'b_rating': entry['rating']})
+            if 'is_favorite' in entry:
+                favorites.append({'b_file_path': file_path, 'b_is_favorite': entry['is_favorite']})
+
+        statements = [
+            (table.update().where(by_path).values(
+                play_count=func.coalesce(table.c.play_count, 0) + bindparam('b_plays'),
+                total_play_time=func.coalesce(table.c.total_play_time, 0) + bindparam('b_play_time')), counters),
+            (table.update().where(by_path).values(last_played=bindparam('b_last_played')), last_played),
+            (table.update().where(by_path).values(rating=bindparam('b_rating')), ratings),
+            (table.update().where(by_path).values(is_favorite=bindparam('b_is_favorite')), favorites),
+        ]
+        if events:
+            # Resolve media ids in SQL; events of files outside the library are dropped
+            events_table = PlayEvent.__table__
+            statements.append((events_table.insert().from_select(
+                ['media_id', 'started_at', 'ended_at', 'seconds'],
+                select(table.c.id,
+                       bindparam('b_started_at', type_=DateTime()),
+                       bindparam('b_ended_at', type_=DateTime()),
+                       bindparam('b_seconds', type_=Float())).where(by_path)
+            ), [{'b_file_path': file_path, 'b_started_at': started_at, 'b_ended_at': ended_at,
+                 'b_seconds': seconds} for file_path, started_at, ended_at, seconds in events]))
+        db = SessionLocal()
+        try:
+            for statement, rows in statements:
+                if rows:
+                    db.execute(statement, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+_stats_writer = None
+
+def get_stats_writer():
+    """The application's shared queue, started on first use and flushed at exit"""
+    global _stats_writer
+    if _stats_writer is None:
+        _stats_writer = StatsWriteQueue()
+        _stats_writer.start()
+        atexit.register(_stats_writer.stop)
+    return _stats_writer
@@ -1,10 +1,11 @@
 from PyQt5.QtWidgets import QWidget, QGridLayout, QLabel, QVBoxLayout
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QIcon
-from src.database import get_db
-from src.database.models import Media
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtGui import QIcon, QPixmap
 import os
-from ...utils.media_visualizer import MediaVisualizer
+from ...config import Config
+from ...utils.metadata_extractor import MetadataExtractor
+from .tile_loader import TileLoader
+from .search_pipeline import SearchPipeline
 
 class MediaGrid(QWidget):
     media_selected = pyqtSignal(str)
@@ -12,6 +13,28 @@ class MediaGrid(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.media_items = []
+        self._items_by_path = {}
+        self._laid_out_items = []  # Items currently placed in the grid, in order
+        self._columns = None
+        
+        # Tiles are generated off the GUI thread and filled in as they arrive
+        self.tile_loader = TileLoader(parent=self)
+        self.tile_loader.tile_ready.connect(self._on_tile_ready)
+        self._priority_timer = QTimer(self)
+        self._priority_timer.setSingleShot(True)
+        self._priority_timer.setInterval(0)
+        self._priority_timer.timeout.connect(self._update_priorities)
+        
+        # Resizes that change the column count re-flow the grid once they settle
+        self._relayout_timer = QTimer(self)
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.setInterval(50)
+        self._relayout_timer.timeout.connect(self._reflow)
+        
+        # Searches run on a worker and come back as one result set
+        self.search_pipeline = SearchPipeline(self)
+        self.search_pipeline.results_ready.connect(self._apply_filter)
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -167,28 +190,15 @@ class MediaGrid(QWidget):
         item_layout.setContentsMargins(0, 0, 0, 0)
         item_layout.setSpacing(10)
         
-        # Get metadata and media info
-        from src.utils.metadata_extractor import MetadataExtractor
-        metadata = MetadataExtractor.extract_metadata(file_path)
-        media_info = MediaVisualizer.get_media_info(file_path)
+        # Placeholder metadata from the file name; the tile loader fills in the rest
+        metadata = MetadataExtractor.extract_from_file(file_path, None)
         
-        # Add visualization with enhanced styling
-        if metadata['media_type'] == 'audio':
-            waveform = MediaVisualizer.generate_waveform(file_path)
-            if waveform:
-                visual_label = QLabel()
-                visual_label.setProperty("class", "visual-label")
-                visual_label.setPixmap(waveform.scaled(320, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                visual_label.setAlignment(Qt.AlignCenter)
-                item_layout.addWidget(visual_label)
-        else:
-            thumbnail = MediaVisualizer.generate_video_thumbnail(file_path)
-            if thumbnail:
-                visual_label = QLabel()
-                visual_label.setProperty("class", "visual-label")
-                visual_label.setPixmap(thumbnail.scaled(320, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                visual_label.setAlignment(Qt.AlignCenter)
-                item_layout.addWidget(visual_label)
+        # Visualization placeholder with enhanced styling
+        visual_label = QLabel("Loading…")
+        visual_label.setProperty("class", "visual-label")
+        visual_label.setAlignment(Qt.AlignCenter)
+        visual_label.setMinimumSize(320, 120 if metadata['media_type'] == 'audio' else 180)
+        item_layout.addWidget(visual_label)
         
         # Create metadata container with modern styling
         metadata_container = QWidget()
@@ -205,6 +215,54 @@ class MediaGrid(QWidget):
         # Info with improved layout
         info_label = QLabel()
         info_label.setProperty("class", "info-label")
+        info_label.setWordWrap(True)
+        metadata_layout.addWidget(info_label)
+        
+        item_layout.addWidget(metadata_container)
+        
+        # Make widget clickable with ripple effect
+        item_widget.mousePressEvent = lambda e, path=file_path: self.media_selected.emit(path)
+        
+        # Append after the tiles currently laid out
+        row, col = divmod(len(self._laid_out_items), self.column_count())
+        self.grid_layout.addWidget(item_widget, row, col)
+        
+        item = {
+            'widget': item_widget,
+            'file_path': file_path,
+            'metadata': metadata,
+            'visual_label': visual_label,
+            'title_label': title_label,
+            'info_label': info_label,
+            'loaded': False
+        }
+        self.media_items.append(item)
+        self._laid_out_items.append(item)
+        self._items_by_path.setdefault(file_path, []).append(item)
+        self.search_pipeline.set_metadata(file_path, metadata)
+        
+        # Queue artwork and metadata; visible tiles get bumped once laid out
+        self.tile_loader.request(file_path)
+        self._schedule_priority_update()
+    
+    def _on_tile_ready(self, file_path, metadata, media_info, image):
+        """Fill in placeholder tiles once their artwork and metadata are ready"""
+        pixmap = QPixmap.fromImage(image) if image is not None else None
+        for item in self._items_by_path.get(file_path, []):
+            if metadata:
+                item['metadata'] = metadata
+                self.search_pipeline.set_metadata(file_path, metadata)
+            item['loaded'] = True
+            
+            if pixmap is not None:
+                item['visual_label'].setPixmap(pixmap)
+            else:
+                item['visual_label'].hide()
+            
+            item['title_label'].setText(item['metadata']['title'] or os.path.basename(file_path))
+            item['info_label'].setText(self._format_info_text(item['metadata'], media_info))
+    
+    def _format_info_text(self, metadata, media_info):
         info_text = []
         
         if metadata['artist']:
@@ -223,84 +281,109 @@ class MediaGrid(QWidget):
                 }.get(key.lower(), '•')
                 info_text.append(f"{icon} {key.replace('_', ' ').title()}: {value}")
         
-        info_label.setText('\n'.join(info_text))
-        info_label.setWordWrap(True)
-        metadata_layout.addWidget(info_label)
-        
-        item_layout.addWidget(metadata_container)
-        
-        # Make widget clickable with ripple effect
-        item_widget.mousePressEvent = lambda e, path=file_path: self.media_selected.emit(path)
+        return '\n'.join(info_text)
+    
+    def _schedule_priority_update(self):
+        # Coalesce bursts of additions into one visibility pass
+        if not self._priority_timer.isActive():
+            self._priority_timer.start()
+    
+    def _update_priorities(self):
+        """Serve tiles that are on screen before the ones that are only prefetched"""
+        visible_paths = [
+            item['file_path'] for item in self.media_items
+            if not item['loaded'] and item['widget'].isVisible()
+            and not item['widget'].visibleRegion().isEmpty()
+        ]
+        self.tile_loader.prioritize(visible_paths, TileLoader.PRIORITY_VISIBLE)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_priority_update()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.column_count() != self._columns:
+            self._relayout_timer.start()
+        self._schedule_priority_update()
+    
+    def column_count(self):
+        """Configured column count, or as many tiles as fit the current width"""
+        if Config.MEDIA_GRID_COLUMNS:
+            return Config.MEDIA_GRID_COLUMNS
+        margins = self.grid_layout.contentsMargins()
+        available = self.width() - margins.left() - margins.right()
+        spacing = self.grid_layout.horizontalSpacing()
+        return max(1, (available + spacing) // (Config.MEDIA_GRID_TILE_WIDTH + spacing))
+    
+    def _reflow(self):
+        self._relayout(self._laid_out_items)
+    
+    def _relayout(self, visible_items):
+        """Place visible_items in the grid and hide the rest in a single pass.
         
-        # Add to grid with improved layout
-        row = len(self.media_items) // 3  # Changed to 3 items per row for better layout
-        col = len(self.media_items) % 3
-        self.grid_layout.addWidget(item_widget, row, col)
+        Re-adding a widget that is already in a QGridLayout removes it first
+        (a linear search), and showing a child activates the parent's layout,
+        so per-item updates are quadratic. Instead the grid is emptied from
+        the back, visibility is toggled while it is empty, the widgets are
+        placed with updates suspended and the layout is activated once.
+        """
+        columns = self.column_count()
+        self.setUpdatesEnabled(False)
+        try:
+            while self.grid_layout.count():
+                self.grid_layout.takeAt(self.grid_layout.count() - 1)
+            
+            visible_widgets = {id(item['widget']) for item in visible_items}
+            for item in self.media_items:
+                item['widget'].setVisible(id(item['widget']) in visible_widgets)
+            
+            for i, item in enumerate(visible_items):
+                row, col = divmod(i, columns)
+                self.grid_layout.addWidget(item['widget'], row, col)
+        finally:
+            self._laid_out_items = list(visible_items)
+            self._columns = columns
+            self.setUpdatesEnabled(True)
+        self.grid_layout.activate()
+    
+    def filter_media(self, search_text, filter_type):
+        self.search_pipeline.submit(search_text, filter_type)
+    
+    def _apply_filter(self, visible_paths):
+        """Show the tiles in visible_paths (None shows all) in one layout pass"""
+        if visible_paths is None:
+            visible_items = list(self.media_items)
+        else:
+            visible_items = [item for item in self.media_items if item['file_path'] in visible_paths]
         
-        self.media_items.append({
-            'widget': item_widget,
-            'file_path': file_path,
-            'metadata': metadata
-        })
+        self._relayout(visible_items)
         
-    def filter_media(self, search_text, filter_type):
-                # Get database connection
-        self.db = next(get_db())
+        # Drop queued work for tiles the filter hid and re-queue the ones still shown
+        self.tile_loader.clear_pending()
+        for item in visible_items:
+            if not item['loaded']:
+                self.tile_loader.request(item['file_path'])
+        self._schedule_priority_update()
         
-        for item in self.media_items:
-            item['widget'].setVisible(False)
-            
-        visible_items = []
-        for item in self.media_items:
-            if not search_text:  # Show all items if search is empty
-                item['widget'].setVisible(True)
-                visible_items.append(item)
-                continue
-                
-            # Get media from database for filtering
-            media = db.query(Media).filter(Media.file_path == item['file_path']).first()
-            show_item = False
-            search_text = search_text.lower()
-            
-            if filter_type == 'all':
-                # Search in metadata
-                show_item = any(search_text in str(value).lower() 
-                               for value in item['metadata'].values() if value)
-                               
-                # Search in tags
-                if media and media.tags:
-                    show_item = show_item or any(search_text in tag.name.lower() 
-                                                for tag in media.tags)
-                                                
-                # Search in categories
-                if media and media.categories:
-                    show_item = show_item or any(search_text in cat.name.lower() 
-                                                for cat in media.categories)
-                                                
-            elif filter_type == 'tag' and media:
-                show_item = any(search_text in tag.name.lower() for tag in media.tags)
-                
-            elif filter_type == 'category' and media:
-                show_item = any(search_text in cat.name.lower() for cat in media.categories)
-                
-            elif filter_type == 'favorite' and media:
-                show_item = media.is_favorite
-                
-            elif filter_type in item['metadata'] and item['metadata'][filter_type]:
-                show_item = search_text in str(item['metadata'][filter_type]).lower()
-                
-            item['widget'].setVisible(show_item)
-            if show_item:
-                visible_items.append(item)
+    def load_pages(self, pager):
+        """Replace the grid with every row of a pager; this widget grid has no lazy paging"""
+        self.clear_media_items()
+        page = pager.next_page()
+        while page:
+            for row in page:
+                self.add_media_item(row['file_path'])
+            page = pager.next_page()
         
-        # Reposition visible items in grid
-        for i, item in enumerate(visible_items):
-            row = i // 4
-            col = i % 4
-            self.grid_layout.addWidget(item['widget'], row, col)
+    def file_paths(self):
+        return [item['file_path'] for item in self.media_items]
         
     def clear_media_items(self):
+        self.tile_loader.cancel()
         for item in self.media_items:
             self.grid_layout.removeWidget(item["widget"])
             item["widget"].deleteLater()
-        self.media_items.clear()
\ No newline at end of file
+        self.media_items.clear()
+        self._laid_out_items.clear()
+        self._items_by_path.clear()
+        self.search_pipeline.clear_metadata()
\ No newline at end of file
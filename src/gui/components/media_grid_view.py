@@ -0,0 +1,337 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt5.QtCore import Qt, pyqtSignal, QAbstractListModel, QModelIndex, QSize, QRect, QRectF, QPoint
+from PyQt5.QtGui import QPixmap, QPixmapCache, QColor, QPainter, QPainterPath, QFont, QPen
+import os
+from ...config import Config
+from .tile_loader import TileLoader
+from .search_pipeline import SearchPipeline
+
+class MediaListModel(QAbstractListModel):
+    """List model over media file paths with lazily loaded tile data.
+
+    Only the path list and a few short strings per loaded row are kept;
+    artwork lives in the bounded QPixmapCache and is requested from the
+    tile loader the first time a row is painted.
+    """
+    FilePathRole = Qt.UserRole
+    SubtitleRole = Qt.UserRole + 1
+    InfoRole = Qt.UserRole + 2
+    MediaTypeRole = Qt.UserRole + 3
+    
+    paths_fetched = pyqtSignal(list)  # file paths appended by fetchMore()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._all_paths = []
+        self._known = set()  # Every path in self._all_paths, shown or not
+        self._visible = None  # Paths passing the active filter, or None when unfiltered
+        self._rows = []  # Paths currently shown, in display order
+        self._row_of = {}  # file_path -> row in self._rows
+        self._details = {}  # file_path -> (title, artist, album, info_text)
+        self._pager = None  # Source of further rows for fetchMore(), e.g. a PlaylistPager
+
+        QPixmapCache.setCacheLimit(Config.ARTWORK_CACHE_KB)
+        self.tile_loader = TileLoader(parent=self)
+        self.tile_loader.tile_ready.connect(self._on_tile_ready)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        file_path = self._rows[index.row()]
+        details = self._details.get(file_path)
+
+        if role == Qt.DisplayRole:
+            return details[0] if details else os.path.splitext(os.path.basename(file_path))[0]
+        if role == self.FilePathRole or role == Qt.ToolTipRole:
+            return file_path
+        if role == self.SubtitleRole:
+            return ' — '.join(value for value in details[1:3] if value) if details else ''
+        if role == self.InfoRole:
+            return details[3] if details else ''
+        if role == self.MediaTypeRole:
+            return 'video' if file_path.lower().endswith(('.mp4', '.avi', '.mkv')) else 'audio'
+        if role == Qt.DecorationRole:
+            # Only rows that are being painted ask for artwork, so loading follows the viewport
+            pixmap = QPixmapCache.find(self._artwork_key(file_path))
+            if pixmap is None or pixmap.isNull():
+                self.tile_loader.request(file_path, TileLoader.PRIORITY_VISIBLE)
+                return None
+            return pixmap
+        return None
+
+    def prefetch(self, first_row, count):
+        """Queue tile data for rows just past the viewport"""
+        for file_path in self._rows[first_row:first_row + count]:
+            if QPixmapCache.find(self._artwork_key(file_path)) is None:
+                self.tile_loader.request(file_path, TileLoader.PRIORITY_PREFETCH)
+
+    @staticmethod
+    def _artwork_key(file_path):
+        return f"tile:{file_path}"
+
+    def _on_tile_ready(self, file_path, metadata, media_info, image):
+        if metadata:
+            info_text = ' · '.join(str(media_info[key]) for key in ('duration', 'resolution', 'codec')
+                                   if key in media_info)
+            self._details[file_path] = (
+                metadata['title'] or os.path.basename(file_path),
+                metadata['artist'],
+                metadata['album'],
+                info_text
+            )
+        # Failed artwork still gets an (empty) entry so the row does not retry on every paint
+        QPixmapCache.insert(self._artwork_key(file_path),
+                            QPixmap.fromImage(image) if image is not None else QPixmap(1, 1))
+
+        row = self._row_of.get(file_path)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def set_pager(self, pager):
+        """Serve rows from a pager: the view fetches the next page when scrolled to the end"""
+        self._pager = pager
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._pager is not None and not self._pager.exhausted
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        page = self._pager.next_page()
+        file_paths = []
+        for row in page:
+            file_path = row['file_path']
+            file_paths.append(file_path)
+            # Stored metadata labels the tile right away; artwork still loads on first paint
+            self._details.setdefault(file_path, (
+                row['title'] or os.path.splitext(os.path.basename(file_path))[0],
+                row['artist'],
+                row['album'],
+                ''
+            ))
+        self.append_paths(file_paths)
+        self.paths_fetched.emit(file_paths)
+    
+    def fetch_all(self):
+        while self.canFetchMore():
+            self.fetchMore()
+    
+    def append_paths(self, file_paths):
+        """Append media files; while a filter is active only paths it already matched are shown"""
+        new_paths = []
+        for path in file_paths:
+            if path not in self._known:
+                self._known.add(path)
+                new_paths.append(path)
+        self._all_paths.extend(new_paths)
+        file_paths = [path for path in new_paths if self._visible is None or path in self._visible]
+        if not file_paths:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(file_paths) - 1)
+        for offset, file_path in enumerate(file_paths):
+            self._row_of[file_path] = first + offset
+        self._rows.extend(file_paths)
+        self.endInsertRows()
+
+    def set_visible_paths(self, visible_paths):
+        """Show only the given subset of paths (None shows everything)"""
+        self.beginResetModel()
+        self._visible = visible_paths
+        if visible_paths is None:
+            self._rows = list(self._all_paths)
+        else:
+            self._rows = [path for path in self._all_paths if path in visible_paths]
+        self._row_of = {path: row for row, path in enumerate(self._rows)}
+        self.endResetModel()
+        self.tile_loader.clear_pending()
+
+    def clear(self):
+        self.tile_loader.cancel()
+        self.beginResetModel()
+        self._pager = None
+        self._all_paths = []
+        self._known = set()
+        self._visible = None
+        self._rows = []
+        self._row_of = {}
+        self._details = {}
+        self.endResetModel()
+
+    def all_paths(self):
+        return list(self._all_paths)
+
+    def details(self, file_path):
+        return self._details.get(file_path)
+
+class MediaTileDelegate(QStyledItemDelegate):
+    """Paints a media tile (artwork, title, subtitle, info) without any child widgets"""
+    TILE_SIZE = QSize(340, 290)
+    ARTWORK_HEIGHT = 180
+    MARGIN = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QFont()
+        self.title_font.setPointSize(12)
+        self.title_font.setBold(True)
+        self.info_font = QFont()
+        self.info_font.setPointSize(10)
+        self.background = QColor(45, 45, 45)
+        self.hover_background = QColor(61, 61, 61)
+        self.border = QColor(255, 255, 255, 26)
+        self.accent = QColor(74, 144, 226)
+        self.info_color = QColor(176, 190, 197)
+        self.placeholder = QColor(0, 0, 0, 64)
+
+    def sizeHint(self, option, index):
+        return self.TILE_SIZE
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        rect = QRectF(option.rect).adjusted(4, 4, -4, -4)
+        highlighted = option.state & (QStyle.State_MouseOver | QStyle.State_Selected)
+        path = QPainterPath()
+        path.addRoundedRect(rect, 16, 16)
+        painter.fillPath(path, self.hover_background if highlighted else self.background)
+        painter.setPen(QPen(self.accent if highlighted else self.border, 2))
+        painter.drawPath(path)
+
+        inner = option.rect.adjusted(self.MARGIN + 4, self.MARGIN + 4, -self.MARGIN - 4, -self.MARGIN - 4)
+        artwork_rect = QRect(inner.left(), inner.top(), inner.width(), self.ARTWORK_HEIGHT)
+
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None and pixmap.width() > 1:
+            target = pixmap.size().scaled(artwork_rect.size(), Qt.KeepAspectRatio)
+            target_rect = QRect(0, 0, target.width(), target.height())
+            target_rect.moveCenter(artwork_rect.center())
+            painter.drawPixmap(target_rect, pixmap)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.placeholder)
+            painter.drawRoundedRect(QRectF(artwork_rect), 12, 12)
+            if pixmap is None:
+                painter.setPen(self.info_color)
+                painter.setFont(self.info_font)
+                painter.drawText(artwork_rect, Qt.AlignCenter, "Loading…")
+
+        # Text block under the artwork, elided to a single line each
+        text_top = artwork_rect.bottom() + 8
+        painter.setFont(self.title_font)
+        painter.setPen(self.accent)
+        title_rect = QRect(inner.left(), text_top, inner.width(), 24)
+        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, inner.width()))
+
+        painter.setFont(self.info_font)
+        painter.setPen(self.info_color)
+        line_top = title_rect.bottom() + 4
+        for role in (MediaListModel.SubtitleRole, MediaListModel.InfoRole):
+            text = index.data(role)
+            if text:
+                line_rect = QRect(inner.left(), line_top, inner.width(), 20)
+                painter.drawText(line_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                                 painter.fontMetrics().elidedText(text, Qt.ElideRight, inner.width()))
+                line_top = line_rect.bottom() + 2
+
+        painter.restore()
+
+class MediaGridView(QListView):
+    """Virtualized media grid: only the tiles inside the viewport are painted.
+
+    Drop-in alternative to MediaGrid for large libraries; exposes the same
+    media_selected signal and add/filter/clear methods.
+    """
+    media_selected = pyqtSignal(str)
+
+    PREFETCH_ROWS = 24
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.media_model = MediaListModel(self)
+        self.setModel(self.media_model)
+        self.setItemDelegate(MediaTileDelegate(self))
+
+        # Icon mode with uniform sizes lets the view compute geometry without visiting rows
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(500)
+        self.setSpacing(8)
+        self.setGridSize(MediaTileDelegate.TILE_SIZE + QSize(16, 16))
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+
+        # Searches run on a worker and come back as one result set
+        self.search_pipeline = SearchPipeline(self)
+        self.search_pipeline.results_ready.connect(self.media_model.set_visible_paths)
+        self.media_model.tile_loader.tile_ready.connect(self._on_tile_ready)
+        self.media_model.paths_fetched.connect(self.search_pipeline.add_paths)
+
+        self.clicked.connect(self._on_clicked)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+        self.setStyleSheet("""
+            QListView {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #1a1a1a, stop:1 #2d2d2d);
+                border: none;
+                border-radius: 24px;
+                padding: 12px;
+            }
+        """)
+
+    def _on_clicked(self, index):
+        file_path = index.data(MediaListModel.FilePathRole)
+        if file_path:
+            self.media_selected.emit(file_path)
+
+    def _on_tile_ready(self, file_path, metadata, media_info, image):
+        if metadata:
+            self.search_pipeline.set_metadata(file_path, metadata)
+
+    def _on_scrolled(self):
+        # Rows that scrolled away no longer need their queued work; painting re-requests the rest
+        self.media_model.tile_loader.clear_pending()
+        self._prefetch()
+
+    def _prefetch(self):
+        last = self.indexAt(QPoint(self.gridSize().width() // 2, self.viewport().height() - 1))
+        if last.isValid():
+            self.media_model.prefetch(last.row() + 1, self.PREFETCH_ROWS)
+
+    def add_media_item(self, file_path):
+        self.add_media_items([file_path])
+
+    def add_media_items(self, file_paths):
+        """Append many media files in one model insertion"""
+        file_paths = list(file_paths)
+        self.media_model.append_paths(file_paths)
+        self.search_pipeline.add_paths(file_paths)
+
+    def file_paths(self):
+        return self.media_model.all_paths()
+
+    def load_pages(self, pager):
+        """Replace the grid with rows read from a pager, one page now and more on scroll"""
+        self.clear_media_items()
+        self.media_model.set_pager(pager)
+        self.media_model.fetchMore()
+    
+    def filter_media(self, search_text, filter_type):
+        # Filters apply to the whole list, so read any pages not fetched yet (no tile work involved)
+        self.media_model.fetch_all()
+        self.search_pipeline.submit(search_text, filter_type)
+
+    def clear_media_items(self):
+        self.media_model.clear()
+        self.search_pipeline.clear_metadata()
@@ -0,0 +1,28 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from ...utils.library_scanner import LibraryScanner
+
+class LibraryScanWorker(QThread):
+    """Run LibraryScanner.scan() off the GUI thread"""
+    progress = pyqtSignal(str, int, int, float)  # phase, processed, total, files per second
+    scan_finished = pyqtSignal(dict)  # scan summary, empty on failure
+
+    def __init__(self, roots, parent=None):
+        super().__init__(parent)
+        self.roots = roots
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        summary = {}
+        try:
+            summary = LibraryScanner.scan(
+                self.roots,
+                progress_callback=self.progress.emit,
+                is_cancelled=lambda: self._cancelled
+            )
+        except Exception as e:
+            print(f"Error in library scan: {str(e)}")
+        finally:
+            self.scan_finished.emit(summary)
@@ -1,12 +1,20 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
                              QComboBox, QLabel)
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSignal, QTimer
+from ...config import Config
 
 class SearchPanel(QWidget):
     search_changed = pyqtSignal(str, str)  # search text, filter type
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        
+        # Emit once typing pauses instead of on every keystroke
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(Config.SEARCH_DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self._on_search_change)
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -16,7 +24,8 @@ class SearchPanel(QWidget):
         # Search input
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search media...")
-        self.search_input.textChanged.connect(self._on_search_change)
+        self.search_input.textChanged.connect(lambda: self.debounce_timer.start())
+        self.search_input.returnPressed.connect(self._on_search_change)
         
         # Filter dropdown
         self.filter_combo = QComboBox()
@@ -110,6 +119,7 @@ class SearchPanel(QWidget):
         """)
 
     def _on_search_change(self):
+        self.debounce_timer.stop()
         search_text = self.search_input.text()
         filter_type = self.filter_combo.currentText().lower()
         self.search_changed.emit(search_text, filter_type)
\ No newline at end of file
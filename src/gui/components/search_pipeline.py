@@ -0,0 +1,163 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from ...database import get_read_session
+from ...database.search_index import MediaSearchIndex
+from ...utils.metadata_extractor import MetadataExtractor
+
+class SearchSignals(QObject):
+    # generation, {file_path: {column: words}} of the matches, or None to show everything
+    finished = pyqtSignal(int, object)
+
+class SearchJob(QRunnable):
+    """Run one search query on a pool thread"""
+    def __init__(self, pipeline, generation, search_text, filter_type, base):
+        super().__init__()
+        self.pipeline = pipeline
+        self.generation = generation
+        self.search_text = search_text
+        self.filter_type = filter_type
+        self.base = base
+        self.signals = SearchSignals()
+        self.setAutoDelete(False)
+
+    def run(self):
+        matches = None
+        try:
+            if self.base is not None:
+                matches = self._refine()
+            else:
+                matches = self._query()
+        except Exception as e:
+            print(f"Error searching for '{self.search_text}': {str(e)}")
+        finally:
+            self.signals.finished.emit(self.generation, matches)
+
+    def _refine(self):
+        # The new query only adds constraints, so its matches are a subset of the previous ones
+        return {
+            file_path: words for file_path, words in self.base.items()
+            if MediaSearchIndex.match_words(words, self.search_text, self.filter_type)
+        }
+
+    def _query(self):
+        if self.pipeline.is_cancelled(self.generation):
+            return None
+        db = get_read_session()
+        try:
+            if self.filter_type == 'favorite':
+                paths = MediaSearchIndex.search(db, self.search_text, self.filter_type, ranked=False)
+                return {file_path: {} for file_path in paths}
+            matches = MediaSearchIndex.search_texts(db, self.search_text, self.filter_type)
+            if matches is None:
+                # No FTS index: use the LIKE fallback and skip refinement next time
+                paths = MediaSearchIndex.search(db, self.search_text, self.filter_type, ranked=False)
+                return {file_path: None for file_path in paths}
+            if self.pipeline.is_cancelled(self.generation):
+                return None
+            indexed = self.pipeline.indexed_paths(db)
+        finally:
+            db.close()
+
+        # Media that is not in the database yet is matched on its tile metadata
+        if self.filter_type in ('all', 'title', 'artist', 'album'):
+            # dict() copies under the GIL, so the GUI thread may keep adding entries
+            for file_path, metadata in dict(self.pipeline.metadata).items():
+                if file_path in matches or file_path in indexed:
+                    continue
+                if metadata is None:
+                    metadata = MetadataExtractor.extract_from_file(file_path, None)
+                words = MediaSearchIndex.metadata_words(metadata)
+                if MediaSearchIndex.match_words(words, self.search_text, self.filter_type):
+                    matches[file_path] = words
+        return matches
+
+class SearchPipeline(QObject):
+    """Debounced-input search backend for the media grids.
+
+    Queries run on a single worker thread and only the newest one counts:
+    a query submitted while another is running replaces any queued one, and
+    results of superseded queries are dropped. A query that extends the
+    previous one (same filter, text starting with the old text) is refined
+    in memory from the previous matches instead of hitting the database.
+    """
+    results_ready = pyqtSignal(object)  # set of file paths to show, or None for all
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        # file_path -> metadata dict (None until its tile loaded) for every grid entry;
+        # only written on the GUI thread
+        self.metadata = {}
+        self._indexed_paths = None
+        self._generation = 0
+        self._running = None
+        self._queued = None
+        # (search_text, filter_type, matches) of the last completed query, for refinement
+        self._last = None
+
+    def is_cancelled(self, generation):
+        return generation != self._generation
+
+    def indexed_paths(self, db):
+        """File paths known to the database, loaded once per invalidate()"""
+        indexed = self._indexed_paths
+        if indexed is None:
+            indexed = MediaSearchIndex.indexed_paths(db)
+            self._indexed_paths = indexed
+        return indexed
+
+    def add_paths(self, file_paths):
+        for file_path in file_paths:
+            self.metadata.setdefault(file_path, None)
+        self._last = None
+
+    def set_metadata(self, file_path, metadata):
+        self.metadata[file_path] = metadata
+        self._last = None
+
+    def clear_metadata(self):
+        self.metadata = {}
+        self._last = None
+
+    def invalidate(self):
+        """Forget cached results after the library or its tags changed"""
+        self._indexed_paths = None
+        self._last = None
+
+    def submit(self, search_text, filter_type):
+        self._generation += 1
+        if not MediaSearchIndex.tokenize(search_text) and filter_type != 'favorite':
+            # Nothing to filter on; no need to involve the worker
+            self._queued = None
+            self._last = None
+            self.results_ready.emit(None)
+            return
+        self._queued = (self._generation, search_text, filter_type)
+        if self._running is None:
+            self._start_queued()
+
+    def _start_queued(self):
+        generation, search_text, filter_type = self._queued
+        self._queued = None
+
+        base = None
+        if self._last is not None and filter_type != 'favorite':
+            last_text, last_filter, last_matches = self._last
+            if (last_filter == filter_type and search_text.lower().startswith(last_text.lower())
+                    and None not in last_matches.values()):
+                base = last_matches
+
+        job = SearchJob(self, generation, search_text, filter_type, base)
+        job.signals.finished.connect(self._on_job_finished)
+        self._running = (job, search_text, filter_type)
+        self.pool.start(job)
+
+    def _on_job_finished(self, generation, matches):
+        job, search_text, filter_type = self._running
+        self._running = None
+
+        if generation == self._generation and matches is not None:
+            self._last = (search_text, filter_type, matches)
+            self.results_ready.emit(set(matches))
+        if self._queued is not None:
+            self._start_queued()
@@ -3,19 +3,24 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QFileDialog, QLa
 from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtGui import QIcon
 from .playlist_panel import PlaylistPanel
-from ...database import get_db
+from .scan_worker import LibraryScanWorker
+from ...utils.library_scanner import LibraryScanner
+from ...database import get_session
 from ...database.models import Media
+from ...database.stats_writer import get_stats_writer
 from PyQt5.QtCore import QTimer, QTime
 from datetime import datetime
 
 class Sidebar(QWidget):
     file_selected = pyqtSignal(str)
+    library_scanned = pyqtSignal(dict)  # scan summary
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.scan_worker = None
         self.recent_media = []
         self.favorite_media = []
-        self.db = next(get_db())
+        self.db = get_session()
         # Initialize time_label before setup_ui
         self.time_label = QLabel()
         self.time_label.setAlignment(Qt.AlignCenter)
@@ -124,6 +129,14 @@ class Sidebar(QWidget):
         self.browse_button = QPushButton("📁 Browse Media")
         self.browse_button.clicked.connect(self.browse_media)
         layout.addWidget(self.browse_button)
+        self.scan_button = QPushButton("🗂 Scan Folder")
+        self.scan_button.setToolTip("Import new files and rescan changed ones")
+        self.scan_button.clicked.connect(self.scan_folder)
+        layout.addWidget(self.scan_button)
+        self.scan_status_label = QLabel()
+        self.scan_status_label.setWordWrap(True)
+        self.scan_status_label.hide()
+        layout.addWidget(self.scan_status_label)
         
         # Favorites section with enhanced visuals
         layout.addSpacing(25)
@@ -253,6 +266,49 @@ class Sidebar(QWidget):
             self.add_to_recent(file_path)
             self.file_selected.emit(file_path)
     
+    def scan_folder(self):
+        """Import every media file below a folder; a second click cancels a running scan"""
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+            self.scan_button.setEnabled(False)
+            return
+        
+        folder = QFileDialog.getExistingDirectory(self, "Select Media Folder")
+        if not folder:
+            return
+        
+        self.scan_worker = LibraryScanWorker([folder], self)
+        self.scan_worker.progress.connect(self.on_scan_progress)
+        self.scan_worker.scan_finished.connect(self.on_scan_finished)
+        self.scan_button.setText("⏹ Cancel Scan")
+        self.scan_status_label.setText("Scanning…")
+        self.scan_status_label.show()
+        self.scan_worker.start()
+    
+    def on_scan_progress(self, phase, processed, total, files_per_second):
+        if phase == LibraryScanner.WALK:
+            self.scan_status_label.setText(f"Scanning… {processed:,} files found ({files_per_second:,.0f} files/s)")
+        else:
+            self.scan_status_label.setText(f"Imported {processed:,} / {total:,} files ({files_per_second:,.0f} files/s)")
+    
+    def on_scan_finished(self, summary):
+        self.scan_worker.wait()
+        self.scan_worker.deleteLater()
+        self.scan_worker = None
+        self.scan_button.setText("🗂 Scan Folder")
+        self.scan_button.setEnabled(True)
+        
+        if summary:
+            status = "Scan cancelled" if summary['cancelled'] else "Scan complete"
+            self.scan_status_label.setText(
+                f"{status}: {summary['added']:,} added, {summary['updated']:,} updated, "
+                f"{summary['moved']:,} moved, {summary['missing']:,} missing, "
+                f"{summary['unchanged']:,} unchanged ({summary['files_per_second']:,.0f} files/s)"
+            )
+            self.library_scanned.emit(summary)
+        else:
+            self.scan_status_label.setText("Scan failed")
+    
     def load_favorites(self):
         """Load favorite media from database"""
         self.favorites_list.clear()
@@ -272,12 +328,8 @@ class Sidebar(QWidget):
             self.recent_list.addItem(item)
     
     def add_to_recent(self, file_path):
-        """Add media to recent list"""
-        media = self.db.query(Media).filter(Media.file_path == file_path).first()
-        if media:
-            media.last_played = time.time()
-            self.db.commit()
-            self.load_recent_media()
+        """Add media to recent list; the list reloads once the queued write is flushed"""
+        get_stats_writer().update_last_played(file_path)
     
     def on_favorite_selected(self, item):
         """Handle favorite media selection"""
@@ -1,40 +1,44 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QPixmap, QColor, QLinearGradient, QPainter
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QTimer, QElapsedTimer
+from PyQt5.QtGui import QPixmap, QImage, QColor, QBrush, QLinearGradient, QPainter
 import numpy as np
+from ...config import Config
 
 class SpectrumAnalyzer(QWidget):
+    """Log-band spectrum bars painted straight onto the widget.
+
+    The background, bar gradient, bar positions and peak-marker glow are
+    built once per resize. A single frame clock (Config.SPECTRUM_UPDATE_INTERVAL)
+    decays the peaks and schedules at most one repaint per frame; new
+    spectra only update the bar values, and the clock stops once the
+    display has settled.
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setup_ui()
         self.setup_analyzer()
         
     def setup_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        self.spectrum_label = QLabel()
-        self.spectrum_label.setAlignment(Qt.AlignCenter)
-        self.spectrum_label.setMinimumSize(320, 120)
-        self.spectrum_label.setStyleSheet("""
-            QLabel {
-                background-color: #1e1e1e;
-                border-radius: 4px;
-            }
-        """)
-        
-        layout.addWidget(self.spectrum_label)
+        self.setMinimumSize(320, 120)
+        self.background_color = QColor(30, 30, 30)
+        self._waveform = None
+        self._background = None
         
     def setup_analyzer(self):
         # Configure spectrum analysis parameters
-        self.num_bands = 64
+        self.num_bands = Config.SPECTRUM_BANDS
         self.min_frequency = 20
         self.max_frequency = 20000
         self.smoothing_factor = 0.3
+        self.sample_rate = Config.SPECTRUM_SAMPLE_RATE
         
         # Initialize spectrum data
         self.current_spectrum = np.zeros(self.num_bands)
         self.peak_spectrum = np.zeros(self.num_bands)
+        self._band_values = np.zeros(self.num_bands)
+        # FFT bin -> band index, rebuilt only when the sample rate, FFT size or band count changes
+        self._band_index_key = None
         
         # Setup colors with enhanced gradient
         self.gradient_colors = [
@@ -52,122 +56,175 @@ class SpectrumAnalyzer(QWidget):
         self.rise_factor = 1.2
         self.min_db = -60
         self.max_db = 0
-        
-        # Setup peak falloff timer
-        self.peak_timer = QTimer(self)
-        self.peak_timer.timeout.connect(self.update_peaks)
-        self.peak_timer.start(50)  # Update every 50ms
-        
-    def update_spectrum(self, fft_data):
+        self.peak_falloff = 0.95  # Peak decay per 50 ms
+        
+        # One clock drives peak falloff and repaints
+        self._spectrum_changed = False
+        self._elapsed = QElapsedTimer()
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setTimerType(Qt.PreciseTimer)
+        self.frame_timer.setInterval(Config.SPECTRUM_UPDATE_INTERVAL)
+        self.frame_timer.timeout.connect(self.advance_frame)
+        self._build_geometry()
+        
+    def configure(self, sample_rate=None, num_bands=None):
+        """Change the sample rate or band count; the band index is rebuilt on the next update"""
+        if sample_rate:
+            self.sample_rate = sample_rate
+        if num_bands and num_bands != self.num_bands:
+            self.num_bands = num_bands
+            self.current_spectrum = np.zeros(num_bands)
+            self.peak_spectrum = np.zeros(num_bands)
+            self._band_values = np.zeros(num_bands)
+            self._build_geometry()
+        self._band_index_key = None
+    
+    def _build_band_index(self, bin_count):
+        """Map the bins of a bin_count-long rfft onto log-spaced bands"""
+        fft_size = max(2, 2 * (bin_count - 1))
+        frequencies = np.fft.rfftfreq(fft_size, 1.0 / self.sample_rate)
+        max_frequency = min(self.max_frequency, self.sample_rate / 2)
+        edges = np.logspace(np.log10(self.min_frequency), np.log10(max_frequency), self.num_bands + 1)
+        
+        # First bin of each band and the end of the last band
+        starts = np.minimum(np.searchsorted(frequencies, edges[:-1]), bin_count - 1)
+        end = int(min(max(np.searchsorted(frequencies, edges[-1], side='right'), starts[-1] + 1), bin_count))
+        # Narrow low bands can share a bin; reduceat then yields that single bin for each of them
+        counts = np.maximum(np.diff(np.append(starts, end)), 1)
+        
+        # A trailing index cuts off bins above the last band
+        self._reduce_indices = np.append(starts, end) if end < bin_count else starts
+        self._reduce_out = np.zeros(len(self._reduce_indices))
+        self._band_scale = 1.0 / counts
+        self._band_index_key = (self.sample_rate, bin_count, self.num_bands)
+    
+    def compute_bands(self, fft_data):
+        """Average FFT magnitudes into the log-spaced bands with one reduceat; returns a reused array"""
+        if self._band_index_key != (self.sample_rate, len(fft_data), self.num_bands):
+            self._build_band_index(len(fft_data))
+        np.add.reduceat(fft_data, self._reduce_indices, out=self._reduce_out)
+        np.multiply(self._reduce_out[:self.num_bands], self._band_scale, out=self._band_values)
+        return self._band_values
+    
+    def update_spectrum(self, fft_data, sample_rate=None):
+        """Show an rfft magnitude spectrum in dB (see SpectrumProcessor)"""
         if fft_data is None or len(fft_data) == 0:
             return
             
         try:
-            # Calculate frequency bands (logarithmic scale)
-            bands = np.logspace(
-                np.log10(self.min_frequency),
-                np.log10(self.max_frequency),
-                self.num_bands
-            )
+            if sample_rate and sample_rate != self.sample_rate:
+                self.configure(sample_rate)
+            new_spectrum = self.compute_bands(fft_data)
             
-            # Calculate spectrum values for each band
-            new_spectrum = np.zeros(self.num_bands)
-            for i in range(self.num_bands):
-                if i < len(fft_data):
-                    new_spectrum[i] = np.mean(fft_data[max(0, i-2):i+3])
+            # Scale min_db..max_db to the 0..1 bar height
+            new_spectrum -= self.min_db
+            new_spectrum *= 1.0 / (self.max_db - self.min_db)
+            np.clip(new_spectrum, 0.0, 1.0, out=new_spectrum)
             
-            # Apply smoothing
-            self.current_spectrum = self.smoothing_factor * new_spectrum + \
-                                  (1 - self.smoothing_factor) * self.current_spectrum
+            # Apply smoothing in place (new_spectrum is a scratch array)
+            new_spectrum *= self.smoothing_factor
+            self.current_spectrum *= 1 - self.smoothing_factor
+            self.current_spectrum += new_spectrum
             
             # Update peak values
-            self.peak_spectrum = np.maximum(self.peak_spectrum, self.current_spectrum)
+            np.maximum(self.peak_spectrum, self.current_spectrum, out=self.peak_spectrum)
             
-            # Draw visualization
-            self.draw_spectrum()
+            # Painted on the next frame tick
+            self._spectrum_changed = True
+            self._start_clock()
             
         except Exception as e:
             print(f"Error updating spectrum: {str(e)}")
+    
+    def _start_clock(self):
+        if not self.frame_timer.isActive():
+            self._elapsed.start()
+            self.frame_timer.start()
             
-    def update_peaks(self):
-        # Decay peak values
-        self.peak_spectrum *= 0.95
-        self.draw_spectrum()
+    def advance_frame(self):
+        """Frame clock tick: decay peaks by the elapsed time and schedule one repaint"""
+        elapsed = self._elapsed.restart()
+        self.peak_spectrum *= self.peak_falloff ** (elapsed / 50.0)
+        self.update()
+        
+        # Stop ticking once nothing visible is left to animate
+        settled = self.peak_spectrum.max() * self._max_height < 0.5
+        if not self.isVisible() or (settled and not self._spectrum_changed):
+            self.frame_timer.stop()
+        self._spectrum_changed = False
+        
+    def set_waveform(self, image):
+        """Show a waveform (QImage or QPixmap) behind the bars; None clears it"""
+        if isinstance(image, QImage):
+            image = QPixmap.fromImage(image)
+        self._waveform = image if image is not None and not image.isNull() else None
+        self._build_background()
+        self.update()
+        
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._build_geometry()
+        
+    def _build_geometry(self):
+        """Prebuild everything that depends only on the widget size"""
+        width, height = self.width(), self.height()
+        self._bar_width = max(1, int(width / (self.num_bands * 1.2)))
+        self._max_height = int(height * 0.85)
+        self._bar_x = (np.arange(self.num_bands) * width / self.num_bands + self._bar_width / 4).astype(int).tolist()
         
-    def draw_spectrum(self):
-        width = self.spectrum_label.width()
-        height = self.spectrum_label.height()
+        gradient = QLinearGradient(0, height, 0, 0)
+        for position, color in zip((0.0, 0.2, 0.4, 0.6, 0.8, 1.0), (0, 1, 2, 3, 4, 6)):
+            gradient.setColorAt(position, self.gradient_colors[color])
+        self._bar_brush = QBrush(gradient)
+        
+        # Peak marker: one pre-rendered glow shared by every bar
+        ratio = self.devicePixelRatioF()
+        self._peak_marker = QPixmap(int(self._bar_width * ratio), int(4 * ratio))
+        self._peak_marker.setDevicePixelRatio(ratio)
+        self._peak_marker.fill(Qt.transparent)
+        glow = QLinearGradient(0, 0, 0, 4)
+        glow.setColorAt(0, QColor(255, 255, 255, 180))
+        glow.setColorAt(1, QColor(255, 255, 255, 0))
+        painter = QPainter(self._peak_marker)
+        painter.fillRect(0, 0, self._bar_width, 4, glow)
+        painter.end()
+        self._build_background()
         
+    def _build_background(self):
+        width, height = self.width(), self.height()
         if width <= 0 or height <= 0:
+            self._background = None
             return
-            
-        # Create pixmap with high DPI support
-        pixmap = QPixmap(width * 2, height * 2)  # Double resolution for better quality
-        pixmap.fill(Qt.transparent)
-        
-        painter = QPainter(pixmap)
+        ratio = self.devicePixelRatioF()
+        background = QPixmap(int(width * ratio), int(height * ratio))
+        background.setDevicePixelRatio(ratio)
+        background.fill(Qt.transparent)
+        painter = QPainter(background)
         painter.setRenderHint(QPainter.Antialiasing)
-        painter.scale(2, 2)  # Scale for high DPI
-        
-        # Calculate bar properties with improved spacing
-        bar_width = int(width / (self.num_bands * 1.2))  # Reduced spacing between bars
-        max_height = int(height * 0.85)  # Slightly taller bars
-        
-        # Enhanced gradient with more vibrant colors
-        gradient = QLinearGradient(0, height, 0, 0)
-        gradient.setColorAt(0.0, QColor(41, 128, 185))    # Blue
-        gradient.setColorAt(0.2, QColor(142, 68, 173))    # Purple
-        gradient.setColorAt(0.4, QColor(26, 188, 156))    # Turquoise
-        gradient.setColorAt(0.6, QColor(46, 204, 113))    # Green
-        gradient.setColorAt(0.8, QColor(241, 196, 15))    # Yellow
-        gradient.setColorAt(1.0, QColor(231, 76, 60))     # Red
-        
-        # Draw spectrum bars with enhanced effects
         painter.setPen(Qt.NoPen)
-        
-        for i in range(self.num_bands):
-            # Calculate smoother bar height with easing
-            value = self.current_spectrum[i]
-            target_height = int(value * max_height)
-            bar_height = target_height
-            
-            x = int(i * width / self.num_bands)
-            y = int(height - bar_height)
-            
-            # Draw bar with gradient
-            painter.setBrush(gradient)
-            painter.drawRoundedRect(
-                int(x + bar_width/4),
-                y,
-                bar_width,
-                bar_height,
-                3, 3  # Slightly rounder corners
-            )
-            
-            # Draw peak marker with glow effect
-            peak_value = self.peak_spectrum[i]
-            peak_y = int(height - (peak_value * max_height))
-            
-            # Glow effect for peak marker
-            glow_gradient = QLinearGradient(0, peak_y, 0, peak_y + 4)
-            glow_gradient.setColorAt(0, QColor(255, 255, 255, 180))
-            glow_gradient.setColorAt(1, QColor(255, 255, 255, 0))
-            
-            painter.fillRect(
-                int(x + bar_width/4),
-                peak_y - 2,
-                bar_width,
-                4,  # Slightly thicker peak marker
-                glow_gradient
-            )
-        
+        painter.setBrush(self.background_color)
+        painter.drawRoundedRect(0, 0, width, height, 4, 4)
+        if self._waveform is not None:
+            waveform = self._waveform.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            painter.drawPixmap((width - waveform.width()) // 2, (height - waveform.height()) // 2, waveform)
         painter.end()
+        self._background = background
         
-        # Update label with high-quality scaling
-        scaled_pixmap = pixmap.scaled(
-            width,
-            height,
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-        self.spectrum_label.setPixmap(scaled_pixmap)
\ No newline at end of file
+    def paintEvent(self, event):
+        if self._background is None:
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._background)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self._bar_brush)
+        
+        height = self.height()
+        bar_width = self._bar_width
+        bar_heights = (self.current_spectrum * self._max_height).astype(int).tolist()
+        peak_tops = (height - self.peak_spectrum * self._max_height).astype(int).tolist()
+        for x, bar_height, peak_y in zip(self._bar_x, bar_heights, peak_tops):
+            if bar_height > 0:
+                painter.drawRoundedRect(x, height - bar_height, bar_width, bar_height, 3, 3)
+            painter.drawPixmap(x, peak_y - 2, self._peak_marker)
+        painter.end()
@@ -1,12 +1,15 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea
 from PyQt5.QtCore import Qt
-from sqlalchemy import func
-from ...database.models import Media
+from datetime import datetime
+from ...database.stats_aggregates import StatsAggregateStore, get_stats_aggregates
 
 class StatisticsPanel(QWidget):
-    def __init__(self, db, parent=None):
+    def __init__(self, db, parent=None, store=None):
         super().__init__(parent)
         self.db = db
+        # Statistics come from the incrementally maintained store, not per-refresh queries
+        self.store = store or get_stats_aggregates()
+        self.store.sections_changed.connect(self.update_statistics)
         self.setup_ui()
         
     def setup_ui(self):
@@ -70,56 +73,50 @@ class StatisticsPanel(QWidget):
         else:
             return "Just now"
         
-    def update_statistics(self):
-        # Get total number of tracks
-        total_tracks = self.db.query(Media).count()
-        self.total_tracks_label.setText(f"Total Tracks: {total_tracks}")
-        
-        # Get most played tracks
-        most_played = self.db.query(Media).order_by(Media.play_count.desc()).limit(3).all()
-        most_played_text = "Most Played Tracks:\n"
-        for track in most_played:
-            most_played_text += f"  • {track.title or track.file_path} ({track.play_count} plays)\n"
-        self.most_played_label.setText(most_played_text)
-        
-        # Get favorite tracks
-        favorites = self.db.query(Media).filter(Media.is_favorite == True).all()
-        favorites_text = f"Favorite Tracks ({len(favorites)}):\n"
-        for track in favorites:
-            favorites_text += f"  • {track.title or track.file_path}\n"
-        self.favorite_tracks_label.setText(favorites_text)
-        
-        # Get total play time
-        total_play_time = self.db.query(Media).with_entities(
-            func.sum(Media.total_play_time)
-        ).scalar() or 0
-        hours = int(total_play_time // 3600)
-        minutes = int((total_play_time % 3600) // 60)
-        self.total_play_time_label.setText(
-            f"Total Listening Time: {hours} hours, {minutes} minutes"
-        )
-        
-        # Get recently played tracks
-        recent_plays = self.db.query(Media).filter(
-            Media.last_played.isnot(None)
-        ).order_by(Media.last_played.desc()).limit(3).all()
-        recent_plays_text = "Recently Played:\n"
-        for track in recent_plays:
-            recent_plays_text += f"  • {track.title or track.file_path} ({self.format_time(track.last_played)})\n"
-        self.recent_plays_label.setText(recent_plays_text)
-        
-        # Get average rating and top rated tracks
-        avg_rating = self.db.query(func.avg(Media.rating)).filter(Media.rating > 0).scalar() or 0
-        top_rated = self.db.query(Media).filter(Media.rating > 0).order_by(Media.rating.desc()).limit(3).all()
-        ratings_text = f"Average Rating: {avg_rating:.1f} stars\n\nTop Rated Tracks:\n"
-        for track in top_rated:
-            stars = "★" * track.rating + "☆" * (5 - track.rating)
-            ratings_text += f"  • {track.title or track.file_path} ({stars})\n"
-        self.ratings_label.setText(ratings_text)
-        
-        # Get most commented tracks
-        commented = self.db.query(Media).filter(Media.comment.isnot(None)).limit(3).all()
-        comments_text = "Most Recent Comments:\n"
-        for track in commented:
-            comments_text += f"  • {track.title or track.file_path}: {track.comment}\n"
-        self.comments_label.setText(comments_text)
\ No newline at end of file
+    def update_statistics(self, sections=None):
+        """Re-render the given sections (all of them by default) from the aggregate store"""
+        store = self.store
+        sections = StatsAggregateStore.SECTIONS if sections is None else sections
+        
+        if StatsAggregateStore.TOTAL_TRACKS in sections:
+            self.total_tracks_label.setText(f"Total Tracks: {store.total_tracks()}")
+        
+        if StatsAggregateStore.MOST_PLAYED in sections:
+            most_played_text = "Most Played Tracks:\n"
+            for title, play_count in store.most_played():
+                most_played_text += f"  • {title} ({play_count} plays)\n"
+            self.most_played_label.setText(most_played_text)
+        
+        if StatsAggregateStore.FAVORITES in sections:
+            favorites_text = f"Favorite Tracks ({store.favorite_count()}):\n"
+            for title in store.favorites():
+                favorites_text += f"  • {title}\n"
+            self.favorite_tracks_label.setText(favorites_text)
+        
+        if StatsAggregateStore.PLAY_TIME in sections:
+            total_play_time = store.total_play_time
+            hours = int(total_play_time // 3600)
+            minutes = int((total_play_time % 3600) // 60)
+            self.total_play_time_label.setText(
+                f"Total Listening Time: {hours} hours, {minutes} minutes"
+            )
+        
+        if StatsAggregateStore.RECENT_PLAYS in sections:
+            now = datetime.now()
+            recent_plays_text = "Recently Played:\n"
+            for title, last_played in store.recent_plays():
+                recent_plays_text += f"  • {title} ({self.format_time((now - last_played).total_seconds())})\n"
+            self.recent_plays_label.setText(recent_plays_text)
+        
+        if StatsAggregateStore.RATINGS in sections:
+            ratings_text = f"Average Rating: {store.average_rating():.1f} stars\n\nTop Rated Tracks:\n"
+            for title, rating in store.top_rated():
+                stars = "★" * rating + "☆" * (5 - rating)
+                ratings_text += f"  • {title} ({stars})\n"
+            self.ratings_label.setText(ratings_text)
+        
+        if StatsAggregateStore.COMMENTS in sections:
+            comments_text = "Most Recent Comments:\n"
+            for title, comment in store.comments():
+                comments_text += f"  • {title}: {comment}\n"
+            self.comments_label.setText(comments_text)
@@ -3,17 +3,31 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 from ...utils.media_stats import MediaStats
 from datetime import datetime
-from ...database import get_db
+from ...database import get_session, get_read_session
 from ...database.models import Media
+from ...database.stats_writer import get_stats_writer
 
 class StatsPanel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.media_stats = MediaStats()
         self.current_media = None
-        self.db = next(get_db())
+        self.db = get_session()
+        self.stats_writer = get_stats_writer()
+        # Start from the stored statistics and follow every queued change
+        self.load_media_stats()
+        self.stats_writer.stats_queued.connect(self.media_stats.apply)
         self.setup_ui()
     
+    def load_media_stats(self):
+        db = get_read_session()
+        try:
+            self.media_stats.load_from_db(db)
+        except Exception as e:
+            print(f"Error loading media statistics: {str(e)}")
+        finally:
+            db.close()
+    
     def setup_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
@@ -135,8 +149,7 @@ class StatsPanel(QWidget):
         """Set rating for current media"""
         if self.current_media:
             try:
-                self.current_media.rating = rating
-                self.db.commit()
+                self.stats_writer.set_rating(self.current_media, rating)
                 self.update_rating_display(rating)
             except Exception as e:
                 print(f"Error setting rating: {str(e)}")
@@ -151,7 +164,7 @@ class StatsPanel(QWidget):
         if self.current_media:
             try:
                 self.current_media.is_favorite = self.favorite_button.isChecked()
-                self.db.commit()
+                self.stats_writer.set_favorite(self.current_media.file_path, self.current_media.is_favorite)
                 self.favorite_button.setText(
                     "❤ Favorite" if self.current_media.is_favorite else "♡ Add to Favorites"
                 )
@@ -267,5 +280,5 @@ class StatsPanel(QWidget):
         """Toggle favorite status for current media"""
         if self.current_media:
             is_favorite = self.favorite_button.isChecked()
-            self.media_stats.set_favorite(self.current_media, is_favorite)
+            self.stats_writer.set_favorite(self.current_media, is_favorite)
             self.favorite_button.setText("♥ Favorite" if is_favorite else "♡ Add to Favorites")
\ No newline at end of file
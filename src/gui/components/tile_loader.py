@@ -0,0 +1,119 @@
+import heapq
+import itertools
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from ...config import Config
+from ...utils.media_probe import MediaProbe
+from ...utils.media_visualizer import MediaVisualizer
+
+class TileSignals(QObject):
+    # generation, file_path, metadata, media_info, QImage or None
+    finished = pyqtSignal(int, str, dict, dict, object)
+
+class TileJob(QRunnable):
+    """Probe a media file and render its tile artwork on a pool thread"""
+    def __init__(self, loader, generation, file_path):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.file_path = file_path
+        self.signals = TileSignals()
+        self.setAutoDelete(False)
+
+    def run(self):
+        metadata, media_info, image = {}, {}, None
+        try:
+            # Skip the work entirely if the grid was cleared while we were queued
+            if not self.loader.is_cancelled(self.generation):
+                probe = MediaProbe.probe(self.file_path)
+                metadata = probe['metadata']
+                media_info = MediaProbe.format_info(probe['info'])
+
+            # QImage only: QPixmaps must be created on the GUI thread
+            if not self.loader.is_cancelled(self.generation):
+                if metadata.get('media_type') == 'audio':
+                    image = MediaVisualizer.generate_waveform_image(self.file_path, 320, 120)
+                elif metadata.get('media_type') == 'video':
+                    image = MediaVisualizer.generate_video_thumbnail_image(self.file_path, 320, 180)
+        except Exception as e:
+            print(f"Error loading tile for {self.file_path}: {str(e)}")
+        finally:
+            self.signals.finished.emit(self.generation, self.file_path, metadata, media_info, image)
+
+class TileLoader(QObject):
+    """Bounded worker pool that fills in media grid tiles in priority order.
+
+    Visible tiles are served before prefetch requests. cancel() drops all
+    queued work and discards results of jobs already running; clear_pending()
+    only drops the queue.
+    """
+    tile_ready = pyqtSignal(str, dict, dict, object)  # file_path, metadata, media_info, QImage
+
+    PRIORITY_VISIBLE = 0
+    PRIORITY_PREFETCH = 1
+
+    def __init__(self, max_workers=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers or Config.TILE_WORKER_THREADS)
+        self._generation = 0
+        self._counter = itertools.count()
+        # Heap of (priority, sequence, file_path); stale entries are skipped lazily
+        self._queue = []
+        self._pending = {}  # file_path -> (priority, sequence)
+        self._running = {}  # file_path -> TileJob, current generation only
+        self._jobs = {}  # TileSignals -> TileJob, keeps every started job alive until it reports back
+
+    def is_cancelled(self, generation):
+        return generation != self._generation
+
+    def request(self, file_path, priority=PRIORITY_PREFETCH):
+        """Queue a tile, or raise the priority of one that is already queued"""
+        if file_path in self._running:
+            return
+        current = self._pending.get(file_path)
+        if current is not None and current[0] <= priority:
+            return
+        entry = (priority, next(self._counter))
+        self._pending[file_path] = entry
+        heapq.heappush(self._queue, (*entry, file_path))
+        self._dispatch()
+
+    def prioritize(self, file_paths, priority=PRIORITY_VISIBLE):
+        """Move already queued tiles to the given priority"""
+        for file_path in file_paths:
+            if file_path in self._pending:
+                self.request(file_path, priority)
+
+    def is_pending(self, file_path):
+        return file_path in self._pending or file_path in self._running
+
+    def clear_pending(self):
+        """Drop every queued request; running jobs still deliver their results"""
+        self._queue.clear()
+        self._pending.clear()
+
+    def cancel(self):
+        """Drop queued requests and discard results from jobs already running"""
+        self._generation += 1
+        self.clear_pending()
+        self._running.clear()
+
+    def _dispatch(self):
+        while self._queue and len(self._running) < self.pool.maxThreadCount():
+            priority, sequence, file_path = heapq.heappop(self._queue)
+            if self._pending.get(file_path) != (priority, sequence):
+                continue
+            del self._pending[file_path]
+
+            job = TileJob(self, self._generation, file_path)
+            job.signals.finished.connect(self._on_job_finished)
+            self._running[file_path] = job
+            self._jobs[job.signals] = job
+            self.pool.start(job)
+
+    def _on_job_finished(self, generation, file_path, metadata, media_info, image):
+        self._jobs.pop(self.sender(), None)
+        if generation == self._generation:
+            self._running.pop(file_path, None)
+            self.tile_ready.emit(file_path, metadata, media_info, image)
+        self._dispatch()
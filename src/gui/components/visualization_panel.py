@@ -80,16 +80,13 @@ class VisualizationPanel(QWidget):
             # Switch to spectrum analyzer for audio
             self.stack.setCurrentWidget(self.spectrum_analyzer)
             # Generate and display initial waveform
-            waveform = MediaVisualizer.generate_waveform(media_path)
-            if waveform:
-                self.spectrum_analyzer.spectrum_label.setPixmap(
-                    waveform.scaled(
-                        self.spectrum_analyzer.spectrum_label.width(),
-                        self.spectrum_analyzer.spectrum_label.height(),
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                )
+            # Render straight at the analyzer size from the cached envelope
+            waveform = MediaVisualizer.generate_waveform_image(
+                media_path,
+                self.spectrum_analyzer.width(),
+                self.spectrum_analyzer.height()
+            )
+            self.spectrum_analyzer.set_waveform(waveform)
         
         elif media_type == 'video':
             # Switch to visualization label for video
@@ -106,10 +103,10 @@ class VisualizationPanel(QWidget):
                     )
                 )
     
-    def update_spectrum(self, audio_data):
+    def update_spectrum(self, spectrum_db, sample_rate=None):
         """Update real-time spectrum visualization for audio playback"""
-        if self.current_media_type != 'audio' or not audio_data:
+        if self.current_media_type != 'audio' or spectrum_db is None or len(spectrum_db) == 0:
             return
             
-        # Forward the audio data to the spectrum analyzer
-        self.spectrum_analyzer.update_spectrum(audio_data)
\ No newline at end of file
+        # Forward the dB spectrum to the spectrum analyzer
+        self.spectrum_analyzer.update_spectrum(spectrum_db, sample_rate)
\ No newline at end of file
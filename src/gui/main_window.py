@@ -1,16 +1,24 @@
 from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSplitter, QMessageBox, QPushButton
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QMediaPlaylist, QAudioProbe
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaPlaylist, QAudioProbe
 from PyQt5.QtMultimediaWidgets import QVideoWidget
-from PyQt5.QtCore import QUrl, QSettings, Qt
-import time
-import numpy as np
+from PyQt5.QtCore import QSettings, Qt
 from ..utils.media_export import ShareDialog
-from ..database import get_db, Base, engine
-from ..database.models import Media
+from ..database import Base, engine
+from ..database.models import Media, Playlist
+from ..database.playlist_pager import PlaylistPager
+from ..database.stats_writer import get_stats_writer
+from ..database.stats_aggregates import reload_stats_aggregates
 from ..utils.metadata_extractor import MetadataExtractor
+from ..utils.library_watcher import LibraryWatcher
+from ..utils.listening_tracker import ListeningTracker
+from ..utils.playlist_index import PlaylistIndex
+from ..utils.audio_analysis_worker import AudioAnalysisWorker
+from ..utils.audio_buffer import audio_buffer_array
+from ..config import Config
 from .components.sidebar import Sidebar
 from .components.search_panel import SearchPanel
 from .components.media_grid import MediaGrid
+from .components.media_grid_view import MediaGridView
 from .components.player_controls import PlayerControls
 from .components.now_playing_panel import NowPlayingPanel
 from .components.visualization_panel import VisualizationPanel
@@ -30,10 +38,39 @@ class MainWindow(QMainWindow):
         # Initialize database connection
         from src.database.manager import DatabaseManager
         self.db = DatabaseManager().get_session()
+        # Play statistics are written behind on a background thread
+        self.stats_writer = get_stats_writer()
+        self.stats_writer.flushed.connect(self.on_stats_flushed)
         self.setup_player()
+        # Accumulate real listened time from player position updates
+        self.listening_tracker = ListeningTracker(self.media_player, self.stats_writer, parent=self)
         self.setup_ui()
         self.setup_connections()
         
+        # Mirror changes under the configured media roots into the library
+        self.library_watcher = LibraryWatcher(parent=self)
+        self.library_watcher.library_changed.connect(self.on_library_changed)
+        self.library_watcher.start()
+        
+    def on_library_changed(self, summary):
+        """Refresh views that depend on library contents after a scan or watcher batch"""
+        self.media_grid.search_pipeline.invalidate()
+        reload_stats_aggregates()
+        self.sidebar.load_favorites()
+        self.sidebar.load_recent_media()
+    
+    def on_stats_flushed(self, file_paths):
+        """Reload the recent and favorite lists once queued statistics reached the database"""
+        self.sidebar.load_favorites()
+        self.sidebar.load_recent_media()
+    
+    def closeEvent(self, event):
+        self.library_watcher.stop()
+        self.listening_tracker.end_session()
+        self.stats_writer.stop()
+        self.audio_worker.stop()
+        super().closeEvent(event)
+        
     def setup_player(self):
         # Initialize media player and playlist
         self.media_player = QMediaPlayer()
@@ -44,6 +81,9 @@ class MainWindow(QMainWindow):
         self.audio_probe = QAudioProbe()
         self.audio_probe.setSource(self.media_player)
         self.audio_probe.audioBufferProbed.connect(self.process_audio_buffer)
+        # Probe buffers are analysed off the GUI thread; the newest spectrum is posted once per frame
+        self.audio_worker = AudioAnalysisWorker(self)
+        self.audio_worker.start()
         
         # Connect error signal
         self.media_player.error.connect(self.handle_media_error)
@@ -51,6 +91,8 @@ class MainWindow(QMainWindow):
         # Create playlist
         self.playlist = QMediaPlaylist()
         self.media_player.setPlaylist(self.playlist)
+        # URL -> position map so lookups do not scan the playlist
+        self.playlist_index = PlaylistIndex(self.playlist, self)
         
         # Load last volume setting
         settings = QSettings()
@@ -63,19 +105,14 @@ class MainWindow(QMainWindow):
     def play_media(self, file_path):
         try:
             # Add to playlist if not already present
-            url = QUrl.fromLocalFile(file_path)
-            if not any(self.playlist.media(i).canonicalUrl() == url for i in range(self.playlist.mediaCount())):
-                self.playlist.addMedia(QMediaContent(url))
+            self.playlist_index.enqueue([file_path])
             
             # Update visualization panel
             media_type = 'video' if file_path.lower().endswith(('.mp4', '.avi', '.mkv')) else 'audio'
             self.visualization_panel.update_visualization(file_path, media_type)
             
             # Set current media
-            for i in range(self.playlist.mediaCount()):
-                if self.playlist.media(i).canonicalUrl() == url:
-                    self.playlist.setCurrentIndex(i)
-                    break
+            self.playlist.setCurrentIndex(self.playlist_index.index_of(file_path))
             
             # Show/hide video widget based on media type
             if file_path.lower().endswith(('.mp4', '.avi', '.mkv')):
@@ -85,15 +122,12 @@ class MainWindow(QMainWindow):
                 self.video_widget.hide()
                 self.player_controls.set_current_video(None)
                 
+            # Queue the play; the count is written behind without blocking playback
+            self.stats_writer.record_play(file_path)
             # Update now playing panel and media statistics
             self.stats_panel.update_stats(file_path)
             media = self.db.query(Media).filter(Media.file_path == file_path).first()
             if media:
-                # Update play statistics
-                media.play_count += 1
-                media.last_played = time.time()
-                self.db.commit()
-                
                 self.now_playing_panel.update_current_track(
                     title=media.title,
                     artist=media.artist,
@@ -108,17 +142,22 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to play media: {str(e)}")
             self.player_controls.enable_controls(False)
+    
+    def queue_media(self, file_paths):
+        """Append files to the play queue in one batch, skipping ones already queued"""
+        return self.playlist_index.enqueue(file_paths)
             
     def process_audio_buffer(self, buffer):
         """Process audio buffer for visualization"""
         if buffer.format().channelCount() > 0:
-            data = buffer.data()
-            # Convert audio buffer to numpy array for visualization
+            # Zero-copy view of the samples in their native format; it keeps the buffer alive
             try:
-                # Convert QByteArray to bytes before using frombuffer
-                byte_data = bytes(data)
-                audio_data = np.frombuffer(byte_data, dtype=np.int16)
-                self.visualization_panel.update_spectrum(audio_data)
+                audio_data = audio_buffer_array(buffer)
+                if audio_data is None:
+                    return
+                # The FFT runs on the analysis worker; spectra come back through spectrum_ready
+                audio_format = buffer.format()
+                self.audio_worker.submit(audio_data, audio_format.channelCount(), audio_format.sampleRate())
             except Exception as e:
                 print(f"Error processing audio buffer: {str(e)}")
                 return
@@ -197,6 +236,7 @@ class MainWindow(QMainWindow):
         """Setup signal/slot connections between components"""
         # Connect sidebar signals
         self.sidebar.file_selected.connect(self.play_media)
+        self.sidebar.library_scanned.connect(self.on_library_changed)
         
         # Connect media grid signals
         self.media_grid.media_selected.connect(self.play_media)
@@ -216,6 +256,9 @@ class MainWindow(QMainWindow):
         # Connect media player signals
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
         self.media_player.stateChanged.connect(self.handle_player_state_change)
+        
+        # Connect analysis worker output (at most one spectrum per display frame)
+        self.audio_worker.spectrum_ready.connect(self.visualization_panel.update_spectrum)
     
         # Set window properties
         self.setMinimumSize(1200, 800)
@@ -227,12 +270,8 @@ class MainWindow(QMainWindow):
             # Get playlist from database
             playlist = self.db.query(Playlist).filter(Playlist.name == playlist_name).first()
             if playlist:
-                # Clear current media grid
-                self.media_grid.clear_media_items()
-                
-                # Add each media file to the grid
-                for media in playlist.media:
-                    self.media_grid.add_media_item(media.file_path)
+                # Replace the grid with the playlist's tracks, in order, one page at a time
+                self.media_grid.load_pages(PlaylistPager(playlist.id))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load playlist: {str(e)}")
     
@@ -290,6 +329,8 @@ class MainWindow(QMainWindow):
         if state == QMediaPlayer.StoppedState:
             self.player_controls.is_playing = False
             self.player_controls.play_button.setText("Play")
+            # Log how the spectrum analysis kept up with playback
+            self.audio_worker.report()
         elif state == QMediaPlayer.PlayingState:
             self.player_controls.is_playing = True
             self.player_controls.play_button.setText("Pause")
@@ -297,7 +338,7 @@ class MainWindow(QMainWindow):
     def refresh_media_display(self):
         """Refresh the media grid display"""
         # Store current media items
-        current_items = [item['file_path'] for item in self.media_grid.media_items]
+        current_items = self.media_grid.file_paths()
         
         # Clear and reload media items
         self.media_grid.clear_media_items()
@@ -307,13 +348,14 @@ class MainWindow(QMainWindow):
     def process_audio_buffer(self, buffer):
         """Process audio buffer for visualization"""
         if buffer.format().channelCount() > 0:
-            data = buffer.data()
-            # Convert audio buffer to numpy array for visualization
+            # Zero-copy view of the samples in their native format; it keeps the buffer alive
             try:
-                # Convert QByteArray to bytes before using frombuffer
-                byte_data = bytes(data)
-                audio_data = np.frombuffer(byte_data, dtype=np.int16)
-                self.visualization_panel.update_spectrum(audio_data)
+                audio_data = audio_buffer_array(buffer)
+                if audio_data is None:
+                    return
+                # The FFT runs on the analysis worker; spectra come back through spectrum_ready
+                audio_format = buffer.format()
+                self.audio_worker.submit(audio_data, audio_format.channelCount(), audio_format.sampleRate())
             except Exception as e:
                 print(f"Error processing audio buffer: {str(e)}")
                 return
@@ -382,7 +424,7 @@ class MainWindow(QMainWindow):
         display_layout.setSpacing(20)
         
         # Add media grid with enhanced visuals
-        self.media_grid = MediaGrid()
+        self.media_grid = MediaGridView() if Config.VIRTUALIZED_MEDIA_GRID else MediaGrid()
         display_layout.addWidget(self.media_grid, 2)
         
         # Add video widget and visualization in a container
@@ -462,6 +504,7 @@ class MainWindow(QMainWindow):
         """Setup signal/slot connections between components"""
         # Connect sidebar signals
         self.sidebar.file_selected.connect(self.play_media)
+        self.sidebar.library_scanned.connect(self.on_library_changed)
         
         # Connect media grid signals
         self.media_grid.media_selected.connect(self.play_media)
@@ -481,6 +524,9 @@ class MainWindow(QMainWindow):
         # Connect media player signals
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
         self.media_player.stateChanged.connect(self.handle_player_state_change)
+        
+        # Connect analysis worker output (at most one spectrum per display frame)
+        self.audio_worker.spectrum_ready.connect(self.visualization_panel.update_spectrum)
     
         # Set window properties
         self.setMinimumSize(1200, 800)
@@ -492,12 +538,8 @@ class MainWindow(QMainWindow):
             # Get playlist from database
             playlist = self.db.query(Playlist).filter(Playlist.name == playlist_name).first()
             if playlist:
-                # Clear current media grid
-                self.media_grid.clear_media_items()
-                
-                # Add each media file to the grid
-                for media in playlist.media:
-                    self.media_grid.add_media_item(media.file_path)
+                # Replace the grid with the playlist's tracks, in order, one page at a time
+                self.media_grid.load_pages(PlaylistPager(playlist.id))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load playlist: {str(e)}")
     
@@ -555,6 +597,8 @@ class MainWindow(QMainWindow):
         if state == QMediaPlayer.StoppedState:
             self.player_controls.is_playing = False
             self.player_controls.play_button.setText("Play")
+            # Log how the spectrum analysis kept up with playback
+            self.audio_worker.report()
         elif state == QMediaPlayer.PlayingState:
             self.player_controls.is_playing = True
             self.player_controls.play_button.setText("Pause")
@@ -562,7 +606,7 @@ class MainWindow(QMainWindow):
     def refresh_media_display(self):
         """Refresh the media grid display"""
         # Store current media items
-        current_items = [item['file_path'] for item in self.media_grid.media_items]
+        current_items = self.media_grid.file_paths()
         
         # Clear and reload media items
         self.media_grid.clear_media_items()
@@ -572,13 +616,14 @@ class MainWindow(QMainWindow):
     def process_audio_buffer(self, buffer):
         """Process audio buffer for visualization"""
         if buffer.format().channelCount() > 0:
-            data = buffer.data()
-            # Convert audio buffer to numpy array for visualization
+            # Zero-copy view of the samples in their native format; it keeps the buffer alive
             try:
-                # Convert QByteArray to bytes before using frombuffer
-                byte_data = bytes(data)
-                audio_data = np.frombuffer(byte_data, dtype=np.int16)
-                self.visualization_panel.update_spectrum(audio_data)
+                audio_data = audio_buffer_array(buffer)
+                if audio_data is None:
+                    return
+                # The FFT runs on the analysis worker; spectra come back through spectrum_ready
+                audio_format = buffer.format()
+                self.audio_worker.submit(audio_data, audio_format.channelCount(), audio_format.sampleRate())
             except Exception as e:
                 print(f"Error processing audio buffer: {str(e)}")
                 return
@@ -647,7 +692,7 @@ class MainWindow(QMainWindow):
         display_layout.setSpacing(20)
         
         # Add media grid with enhanced visuals
-        self.media_grid = MediaGrid()
+        self.media_grid = MediaGridView() if Config.VIRTUALIZED_MEDIA_GRID else MediaGrid()
         display_layout.addWidget(self.media_grid, 2)
         
         # Add video widget and visualization in a container
@@ -727,6 +772,7 @@ class MainWindow(QMainWindow):
         """Setup signal/slot connections between components"""
         # Connect sidebar signals
         self.sidebar.file_selected.connect(self.play_media)
+        self.sidebar.library_scanned.connect(self.on_library_changed)
         
         # Connect media grid signals
         self.media_grid.media_selected.connect(self.play_media)
@@ -746,6 +792,9 @@ class MainWindow(QMainWindow):
         # Connect media player signals
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
         self.media_player.stateChanged.connect(self.handle_player_state_change)
+        
+        # Connect analysis worker output (at most one spectrum per display frame)
+        self.audio_worker.spectrum_ready.connect(self.visualization_panel.update_spectrum)
     
         # Set window properties
         self.setMinimumSize(1200, 800)
@@ -757,12 +806,8 @@ class MainWindow(QMainWindow):
             # Get playlist from database
             playlist = self.db.query(Playlist).filter(Playlist.name == playlist_name).first()
             if playlist:
-                # Clear current media grid
-                self.media_grid.clear_media_items()
-                
-                # Add each media file to the grid
-                for media in playlist.media:
-                    self.media_grid.add_media_item(media.file_path)
+                # Replace the grid with the playlist's tracks, in order, one page at a time
+                self.media_grid.load_pages(PlaylistPager(playlist.id))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load playlist: {str(e)}")
     
@@ -820,6 +865,8 @@ class MainWindow(QMainWindow):
         if state == QMediaPlayer.StoppedState:
             self.player_controls.is_playing = False
             self.player_controls.play_button.setText("Play")
+            # Log how the spectrum analysis kept up with playback
+            self.audio_worker.report()
         elif state == QMediaPlayer.PlayingState:
             self.player_controls.is_playing = True
             self.player_controls.play_button.setText("Pause")
@@ -827,7 +874,7 @@ class MainWindow(QMainWindow):
     def refresh_media_display(self):
         """Refresh the media grid display"""
         # Store current media items
-        current_items = [item['file_path'] for item in self.media_grid.media_items]
+        current_items = self.media_grid.file_paths()
         
         # Clear and reload media items
         self.media_grid.clear_media_items()
@@ -837,13 +884,14 @@ class MainWindow(QMainWindow):
     def process_audio_buffer(self, buffer):
         """Process audio buffer for visualization"""
         if buffer.format().channelCount() > 0:
-            data = buffer.data()
-            # Convert audio buffer to numpy array for visualization
+            # Zero-copy view of the samples in their native format; it keeps the buffer alive
             try:
-                # Convert QByteArray to bytes before using frombuffer
-                byte_data = bytes(data)
-                audio_data = np.frombuffer(byte_data, dtype=np.int16)
-                self.visualization_panel.update_spectrum(audio_data)
+                audio_data = audio_buffer_array(buffer)
+                if audio_data is None:
+                    return
+                # The FFT runs on the analysis worker; spectra come back through spectrum_ready
+                audio_format = buffer.format()
+                self.audio_worker.submit(audio_data, audio_format.channelCount(), audio_format.sampleRate())
             except Exception as e:
                 print(f"Error processing audio buffer: {str(e)}")
                 return
@@ -912,7 +960,7 @@ class MainWindow(QMainWindow):
         display_layout.setSpacing(20)
         
         # Add media grid with enhanced visuals
-        self.media_grid = MediaGrid()
+        self.media_grid = MediaGridView() if Config.VIRTUALIZED_MEDIA_GRID else MediaGrid()
         display_layout.addWidget(self.media_grid, 2)
         
         # Add video widget and visualization in a container
@@ -992,6 +1040,7 @@ class MainWindow(QMainWindow):
         """Setup signal/slot connections between components"""
         # Connect sidebar signals
         self.sidebar.file_selected.connect(self.play_media)
+        self.sidebar.library_scanned.connect(self.on_library_changed)
         
         # Connect media grid signals
         self.media_grid.media_selected.connect(self.play_media)
@@ -1011,6 +1060,9 @@ class MainWindow(QMainWindow):
         # Connect media player signals
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
         self.media_player.stateChanged.connect(self.handle_player_state_change)
+        
+        # Connect analysis worker output (at most one spectrum per display frame)
+        self.audio_worker.spectrum_ready.connect(self.visualization_panel.update_spectrum)
     
         # Set window properties
         self.setMinimumSize(1200, 800)
@@ -1022,12 +1074,8 @@ class MainWindow(QMainWindow):
             # Get playlist from database
             playlist = self.db.query(Playlist).filter(Playlist.name == playlist_name).first()
             if playlist:
-                # Clear current media grid
-                self.media_grid.clear_media_items()
-                
-                # Add each media file to the grid
-                for media in playlist.media:
-                    self.media_grid.add_media_item(media.file_path)
+                # Replace the grid with the playlist's tracks, in order, one page at a time
+                self.media_grid.load_pages(PlaylistPager(playlist.id))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load playlist: {str(e)}")
     
@@ -1085,6 +1133,8 @@ class MainWindow(QMainWindow):
         if state == QMediaPlayer.StoppedState:
             self.player_controls.is_playing = False
             self.player_controls.play_button.setText("Play")
+            # Log how the spectrum analysis kept up with playback
+            self.audio_worker.report()
         elif state == QMediaPlayer.PlayingState:
             self.player_controls.is_playing = True
             self.player_controls.play_button.setText("Pause")
@@ -1092,7 +1142,7 @@ class MainWindow(QMainWindow):
     def refresh_media_display(self):
         """Refresh the media grid display"""
         # Store current media items
-        current_items = [item['file_path'] for item in self.media_grid.media_items]
+        current_items = self.media_grid.file_paths()
         
         # Clear and reload media items
         self.media_grid.clear_media_items()
@@ -1102,13 +1152,14 @@ class MainWindow(QMainWindow):
     def process_audio_buffer(self, buffer):
         """Process audio buffer for visualization"""
         if buffer.format().channelCount() > 0:
-            data = buffer.data()
-            # Convert audio buffer to numpy array for visualization
+            # Zero-copy view of the samples in their native format; it keeps the buffer alive
             try:
-                # Convert QByteArray to bytes before using frombuffer
-                byte_data = bytes(data)
-                audio_data = np.frombuffer(byte_data, dtype=np.int16)
-                self.visualization_panel.update_spectrum(audio_data)
+                audio_data = audio_buffer_array(buffer)
+                if audio_data is None:
+                    return
+                # The FFT runs on the analysis worker; spectra come back through spectrum_ready
+                audio_format = buffer.format()
+                self.audio_worker.submit(audio_data, audio_format.channelCount(), audio_format.sampleRate())
             except Exception as e:
                 print(f"Error processing audio buffer: {str(e)}")
                 return
@@ -1177,7 +1228,7 @@ class MainWindow(QMainWindow):
         display_layout.setSpacing(20)
         
         # Add media grid with enhanced visuals
-        self.media_grid = MediaGrid()
+        self.media_grid = MediaGridView() if Config.VIRTUALIZED_MEDIA_GRID else MediaGrid()
         display_layout.addWidget(self.media_grid, 2)
         
         # Add video widget and visualization in a container
@@ -1257,6 +1308,7 @@ class MainWindow(QMainWindow):
         """Setup signal/slot connections between components"""
         # Connect sidebar signals
         self.sidebar.file_selected.connect(self.play_media)
+        self.sidebar.library_scanned.connect(self.on_library_changed)
         
         # Connect media grid signals
         self.media_grid.media_selected.connect(self.play_media)
@@ -1276,6 +1328,9 @@ class MainWindow(QMainWindow):
         # Connect media player signals
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
         self.media_player.stateChanged.connect(self.handle_player_state_change)
+        
+        # Connect analysis worker output (at most one spectrum per display frame)
+        self.audio_worker.spectrum_ready.connect(self.visualization_panel.update_spectrum)
     
         # Set window properties
         self.setMinimumSize(1200, 800)
@@ -1287,12 +1342,8 @@ class MainWindow(QMainWindow):
             # Get playlist from database
             playlist = self.db.query(Playlist).filter(Playlist.name == playlist_name).first()
             if playlist:
-                # Clear current media grid
-                self.media_grid.clear_media_items()
-                
-                # Add each media file to the grid
-                for media in playlist.media:
-                    self.media_grid.add_media_item(media.file_path)
+                # Replace the grid with the playlist's tracks, in order, one page at a time
+                self.media_grid.load_pages(PlaylistPager(playlist.id))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load playlist: {str(e)}")
     
@@ -1350,6 +1401,8 @@ class MainWindow(QMainWindow):
         if state == QMediaPlayer.StoppedState:
             self.player_controls.is_playing = False
             self.player_controls.play_button.setText("Play")
+            # Log how the spectrum analysis kept up with playback
+            self.audio_worker.report()
         elif state == QMediaPlayer.PlayingState:
             self.player_controls.is_playing = True
             self.player_controls.play_button.setText("Pause")
@@ -1357,7 +1410,7 @@ class MainWindow(QMainWindow):
     def refresh_media_display(self):
         """Refresh the media grid display"""
         # Store current media items
-        current_items = [item['file_path'] for item in self.media_grid.media_items]
+        current_items = self.media_grid.file_paths()
         
         # Clear and reload media items
         self.media_grid.clear_media_items()
@@ -1367,13 +1420,14 @@ class MainWindow(QMainWindow):
     def process_audio_buffer(self, buffer):
         """Process audio buffer for visualization"""
         if buffer.format().channelCount() > 0:
-            data = buffer.data()
-            # Convert audio buffer to numpy array for visualization
+            # Zero-copy view of the samples in their native format; it keeps the buffer alive
             try:
-                # Convert QByteArray to bytes before using frombuffer
-                byte_data = bytes(data)
-                audio_data = np.frombuffer(byte_data, dtype=np.int16)
-                self.visualization_panel.update_spectrum(audio_data)
+                audio_data = audio_buffer_array(buffer)
+                if audio_data is None:
+                    return
+                # The FFT runs on the analysis worker; spectra come back through spectrum_ready
+                audio_format = buffer.format()
+                self.audio_worker.submit(audio_data, audio_format.channelCount(), audio_format.sampleRate())
             except Exception as e:
                 print(f"Error processing audio buffer: {str(e)}")
                 return
@@ -1442,7 +1496,7 @@ class MainWindow(QMainWindow):
         display_layout.setSpacing(20)
         
         # Add media grid with enhanced visuals
-        self.media_grid = MediaGrid()
+        self.media_grid = MediaGridView() if Config.VIRTUALIZED_MEDIA_GRID else MediaGrid()
         display_layout.addWidget(self.media_grid, 2)
         
         # Add video widget and visualization in a container
@@ -1522,6 +1576,7 @@ class MainWindow(QMainWindow):
         """Setup signal/slot connections between components"""
         # Connect sidebar signals
         self.sidebar.file_selected.connect(self.play_media)
+        self.sidebar.library_scanned.connect(self.on_library_changed)
         
         # Connect media grid signals
         self.media_grid.media_selected.connect(self.play_media)
@@ -1541,6 +1596,9 @@ class MainWindow(QMainWindow):
         # Connect media player signals
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
         self.media_player.stateChanged.connect(self.handle_player_state_change)
+        
+        # Connect analysis worker output (at most one spectrum per display frame)
+        self.audio_worker.spectrum_ready.connect(self.visualization_panel.update_spectrum)
     
         # Set window properties
         self.setMinimumSize(1200, 800)
@@ -1552,12 +1610,8 @@ class MainWindow(QMainWindow):
             # Get playlist from database
             playlist = self.db.query(Playlist).filter(Playlist.name == playlist_name).first()
             if playlist:
-                # Clear current media grid
-                self.media_grid.clear_media_items()
-                
-                # Add each media file to the grid
-                for media in playlist.media:
-                    self.media_grid.add_media_item(media.file_path)
+                # Replace the grid with the playlist's tracks, in order, one page at a time
+                self.media_grid.load_pages(PlaylistPager(playlist.id))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load playlist: {str(e)}")
     
@@ -1615,6 +1669,8 @@ class MainWindow(QMainWindow):
         if state == QMediaPlayer.StoppedState:
             self.player_controls.is_playing = False
             self.player_controls.play_button.setText("Play")
+            # Log how the spectrum analysis kept up with playback
+            self.audio_worker.report()
         elif state == QMediaPlayer.PlayingState:
             self.player_controls.is_playing = True
             self.player_controls.play_button.setText("Pause")
@@ -1622,7 +1678,7 @@ class MainWindow(QMainWindow):
     def refresh_media_display(self):
         """Refresh the media grid display"""
         # Store current media items
-        current_items = [item['file_path'] for item in self.media_grid.media_items]
+        current_items = self.media_grid.file_paths()
         
         # Clear and reload media items
         self.media_grid.clear_media_items()
@@ -1632,13 +1688,14 @@ class MainWindow(QMainWindow):
     def process_audio_buffer(self, buffer):
         """Process audio buffer for visualization"""
         if buffer.format().channelCount() > 0:
-            data = buffer.data()
-            # Convert audio buffer to numpy array for visualization
+            # Zero-copy view of the samples in their native format; it keeps the buffer alive
             try:
-                # Convert QByteArray to bytes before using frombuffer
-                byte_data = bytes(data)
-                audio_data = np.frombuffer(byte_data, dtype=np.int16)
-                self.visualization_panel.update_spectrum(audio_data)
+                audio_data = audio_buffer_array(buffer)
+                if audio_data is None:
+                    return
+                # The FFT runs on the analysis worker; spectra come back through spectrum_ready
+                audio_format = buffer.format()
+                self.audio_worker.submit(audio_data, audio_format.channelCount(), audio_format.sampleRate())
             except Exception as e:
                 print(f"Error processing audio buffer: {str(e)}")
                 return
@@ -1707,7 +1764,7 @@ class MainWindow(QMainWindow):
         display_layout.setSpacing(20)
         
         # Add media grid with enhanced visuals
-        self.media_grid = MediaGrid()
+        self.media_grid = MediaGridView() if Config.VIRTUALIZED_MEDIA_GRID else MediaGrid()
         display_layout.addWidget(self.media_grid, 2)
         
         # Add video widget and visualization in a container
@@ -1787,6 +1844,7 @@ class MainWindow(QMainWindow):
         """Setup signal/slot connections between components"""
         # Connect sidebar signals
         self.sidebar.file_selected.connect(self.play_media)
+        self.sidebar.library_scanned.connect(self.on_library_changed)
         
         # Connect media grid signals
         self.media_grid.media_selected.connect(self.play_media)
@@ -1806,6 +1864,9 @@ class MainWindow(QMainWindow):
         # Connect media player signals
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
         self.media_player.stateChanged.connect(self.handle_player_state_change)
+        
+        # Connect analysis worker output (at most one spectrum per display frame)
+        self.audio_worker.spectrum_ready.connect(self.visualization_panel.update_spectrum)
     
         # Set window properties
         self.setMinimumSize(1200, 800)
@@ -1817,12 +1878,8 @@ class MainWindow(QMainWindow):
             # Get playlist from database
             playlist = self.db.query(Playlist).filter(Playlist.name == playlist_name).first()
             if playlist:
-                # Clear current media grid
-                self.media_grid.clear_media_items()
-                
-                # Add each media file to the grid
-                for media in playlist.media:
-                    self.media_grid.add_media_item(media.file_path)
+                # Replace the grid with the playlist's tracks, in order, one page at a time
+                self.media_grid.load_pages(PlaylistPager(playlist.id))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load playlist: {str(e)}")
     
@@ -1880,6 +1937,8 @@ class MainWindow(QMainWindow):
         if state == QMediaPlayer.StoppedState:
             self.player_controls.is_playing = False
             self.player_controls.play_button.setText("Play")
+            # Log how the spectrum analysis kept up with playback
+            self.audio_worker.report()
         elif state == QMediaPlayer.PlayingState:
             self.player_controls.is_playing = True
             self.player_controls.play_button.setText("Pause")
@@ -1887,7 +1946,7 @@ class MainWindow(QMainWindow):
     def refresh_media_display(self):
         """Refresh the media grid display"""
         # Store current media items
-        current_items = [item['file_path'] for item in self.media_grid.media_items]
+        current_items = self.media_grid.file_paths()
         
         # Clear and reload media items
         self.media_grid.clear_media_items()
@@ -1897,13 +1956,14 @@ class MainWindow(QMainWindow):
     def process_audio_buffer(self, buffer):
         """Process audio buffer for visualization"""
         if buffer.format().channelCount() > 0:
-            data = buffer.data()
-            # Convert audio buffer to numpy array for visualization
+            # Zero-copy view of the samples in their native format; it keeps the buffer alive
             try:
-                # Convert QByteArray to bytes before using frombuffer
-                byte_data = bytes(data)
-                audio_data = np.frombuffer(byte_data, dtype=np.int16)
-                self.visualization_panel.update_spectrum(audio_data)
+                audio_data = audio_buffer_array(buffer)
+                if audio_data is None:
+                    return
+                # The FFT runs on the analysis worker; spectra come back through spectrum_ready
+                audio_format = buffer.format()
+                self.audio_worker.submit(audio_data, audio_format.channelCount(), audio_format.sampleRate())
             except Exception as e:
                 print(f"Error processing audio buffer: {str(e)}")
                 return
@@ -1972,7 +2032,7 @@ class MainWindow(QMainWindow):
         display_layout.setSpacing(20)
         
         # Add media grid with enhanced visuals
-        self.media_grid = MediaGrid()
+        self.media_grid = MediaGridView() if Config.VIRTUALIZED_MEDIA_GRID else MediaGrid()
         display_layout.addWidget(self.media_grid, 2)
         
         # Add video widget and visualization in a container
@@ -2052,6 +2112,7 @@ class MainWindow(QMainWindow):
         """Setup signal/slot connections between components"""
         # Connect sidebar signals
         self.sidebar.file_selected.connect(self.play_media)
+        self.sidebar.library_scanned.connect(self.on_library_changed)
         
         # Connect media grid signals
         self.media_grid.media_selected.connect(self.play_media)
@@ -2071,6 +2132,9 @@ class MainWindow(QMainWindow):
         # Connect media player signals
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
         self.media_player.stateChanged.connect(self.handle_player_state_change)
+        
+        # Connect analysis worker output (at most one spectrum per display frame)
+        self.audio_worker.spectrum_ready.connect(self.visualization_panel.update_spectrum)
     
         # Set window properties
         self.setMinimumSize(1200, 800)
@@ -2082,12 +2146,8 @@ class MainWindow(QMainWindow):
             # Get playlist from database
             playlist = self.db.query(Playlist).filter(Playlist.name == playlist_name).first()
             if playlist:
-                # Clear current media grid
-                self.media_grid.clear_media_items()
-                
-                # Add each media file to the grid
-                for media in playlist.media:
-                    self.media_grid.add_media_item(media.file_path)
+                # Replace the grid with the playlist's tracks, in order, one page at a time
+                self.media_grid.load_pages(PlaylistPager(playlist.id))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load playlist: {str(e)}")
     
@@ -2145,6 +2205,8 @@ class MainWindow(QMainWindow):
         if state == QMediaPlayer.StoppedState:
             self.player_controls.is_playing = False
             self.player_controls.play_button.setText("Play")
+            # Log how the spectrum analysis kept up with playback
+            self.audio_worker.report()
         elif state == QMediaPlayer.PlayingState:
             self.player_controls.is_playing = True
             self.player_controls.play_button.setText("Pause")
@@ -2152,7 +2214,7 @@ class MainWindow(QMainWindow):
     def refresh_media_display(self):
         """Refresh the media grid display"""
         # Store current media items
-        current_items = [item['file_path'] for item in self.media_grid.media_items]
+        current_items = self.media_grid.file_paths()
         
         # Clear and reload media items
         self.media_grid.clear_media_items()
@@ -2162,13 +2224,14 @@ class MainWindow(QMainWindow):
     def process_audio_buffer(self, buffer):
         """Process audio buffer for visualization"""
         if buffer.format().channelCount() > 0:
-            data = buffer.data()
-            # Convert audio buffer to numpy array for visualization
+            # Zero-copy view of the samples in their native format; it keeps the buffer alive
             try:
-                # Convert QByteArray to bytes before using frombuffer
-                byte_data = bytes(data)
-                audio_data = np.frombuffer(byte_data, dtype=np.int16)
-                self.visualization_panel.update_spectrum(audio_data)
+                audio_data = audio_buffer_array(buffer)
+                if audio_data is None:
+                    return
+                # The FFT runs on the analysis worker; spectra come back through spectrum_ready
+                audio_format = buffer.format()
+                self.audio_worker.submit(audio_data, audio_format.channelCount(), audio_format.sampleRate())
             except Exception as e:
                 print(f"Error processing audio buffer: {str(e)}")
                 return
@@ -2237,7 +2300,7 @@ class MainWindow(QMainWindow):
         display_layout.setSpacing(20)
         
         # Add media grid with enhanced visuals
-        self.media_grid = MediaGrid()
+        self.media_grid = MediaGridView() if Config.VIRTUALIZED_MEDIA_GRID else MediaGrid()
         display_layout.addWidget(self.media_grid, 2)
         
         # Add video widget and visualization in a container
@@ -2317,6 +2380,7 @@ class MainWindow(QMainWindow):
         """Setup signal/slot connections between components"""
         # Connect sidebar signals
         self.sidebar.file_selected.connect(self.play_media)
+        self.sidebar.library_scanned.connect(self.on_library_changed)
         
         # Connect media grid signals
         self.media_grid.media_selected.connect(self.play_media)
@@ -2336,6 +2400,9 @@ class MainWindow(QMainWindow):
         # Connect media player signals
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
         self.media_player.stateChanged.connect(self.handle_player_state_change)
+        
+        # Connect analysis worker output (at most one spectrum per display frame)
+        self.audio_worker.spectrum_ready.connect(self.visualization_panel.update_spectrum)
     
         # Set window properties
         self.setMinimumSize(1200, 800)
@@ -2347,12 +2414,8 @@ class MainWindow(QMainWindow):
             # Get playlist from database
             playlist = self.db.query(Playlist).filter(Playlist.name == playlist_name).first()
             if playlist:
-                # Clear current media grid
-                self.media_grid.clear_media_items()
-                
-                # Add each media file to the grid
-                for media in playlist.media:
-                    self.media_grid.add_media_item(media.file_path)
+                # Replace the grid with the playlist's tracks, in order, one page at a time
+                self.media_grid.load_pages(PlaylistPager(playlist.id))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load playlist: {str(e)}")
     
@@ -2410,6 +2473,8 @@ class MainWindow(QMainWindow):
         if state == QMediaPlayer.StoppedState:
             self.player_controls.is_playing = False
             self.player_controls.play_button.setText("Play")
+            # Log how the spectrum analysis kept up with playback
+            self.audio_worker.report()
         elif state == QMediaPlayer.PlayingState:
             self.player_controls.is_playing = True
             self.player_controls.play_button.setText("Pause")
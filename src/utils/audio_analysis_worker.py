@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from ..config import Config
+from .spectrum_processor import SpectrumProcessor
+
+class AudioAnalysisWorker(QObject):
+    """Run spectrum analysis for probed audio on a background thread.
+
+    submit() only appends to a bounded deque (append/popleft are atomic,
+    so producer and consumer never take a lock); when the worker falls
+    behind, the deque discards the oldest buffers and the worker skips
+    everything older than one FFT frame. The newest spectrum is kept in a
+    single slot and handed to the GUI by a timer every
+    Config.SPECTRUM_UPDATE_INTERVAL ms, so the UI sees at most one update
+    per display frame however fast buffers arrive.
+    """
+    spectrum_ready = pyqtSignal(object, int)  # dB spectrum, sample rate
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.processor = SpectrumProcessor()
+        self._queue = deque(maxlen=Config.AUDIO_QUEUE_BUFFERS)
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._latest = None  # (spectrum, sample_rate, sequence), replaced as a whole
+        self._posted_sequence = 0
+        # Each counter has a single writer: received on the submitting thread, the rest on the worker
+        self.received = 0
+        self.dropped = 0  # Buffers discarded unanalysed because the worker was behind
+        self.frames = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.analysis_total = 0.0
+        self._last_received = 0  # Sequence number of the last buffer the worker took off the queue
+
+        self._post_timer = QTimer(self)
+        self._post_timer.setInterval(Config.SPECTRUM_UPDATE_INTERVAL)
+        self._post_timer.timeout.connect(self._post_latest)
+
+    def stats(self):
+        """Counters and timings (milliseconds) since the worker was created"""
+        frames = self.frames or 1
+        return {
+            'received': self.received,
+            'dropped': self.dropped,
+            'frames': self.frames,
+            'latency_ms_avg': self.latency_total / frames * 1000,
+            'latency_ms_max': self.latency_max * 1000,
+            'analysis_ms_avg': self.analysis_total / frames * 1000,
+        }
+
+    def report(self):
+        """Print how well the analysis kept up with playback"""
+        stats = self.stats()
+        if stats['received']:
+            print(f"Audio analysis: {stats['frames']} frames from {stats['received']} buffers, "
+                  f"{stats['dropped']} dropped, latency {stats['latency_ms_avg']:.1f} ms avg / "
+                  f"{stats['latency_ms_max']:.1f} ms max, analysis {stats['analysis_ms_avg']:.2f} ms avg")
+
+    def start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="AudioAnalysisWorker", daemon=True)
+            self._thread.start()
+            self._post_timer.start()
+
+    def stop(self):
+        self._post_timer.stop()
+        if self._thread is not None:
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, samples, channel_count, sample_rate):
+        """Queue one interleaved PCM buffer; never blocks the caller"""
+        self.received += 1
+        # A full deque pushes out its oldest buffer; the worker sees the gap in sequence numbers
+        self._queue.append((samples, channel_count, sample_rate, time.perf_counter(), self.received))
+        self._wakeup.set()
+
+    def _take_fresh(self):
+        """Drain the queue, keeping only the newest buffers that still fit one FFT frame"""
+        buffers = []
+        while True:
+            try:
+                buffers.append(self._queue.popleft())
+            except IndexError:
+                break
+        if not buffers:
+            return buffers
+        # Buffers pushed out of the full deque before the worker got to them
+        self.dropped += buffers[0][4] - self._last_received - 1
+        self._last_received = buffers[-1][4]
+
+        needed = self.processor.fft_size
+        keep = 0
+        for samples, channel_count, _, _, _ in reversed(buffers):
+            keep += 1
+            needed -= len(samples) // max(1, channel_count)
+            if needed <= 0:
+                break
+        self.dropped += len(buffers) - keep
+        return buffers[len(buffers) - keep:]
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            for samples, channel_count, sample_rate, queued_at, _ in self._take_fresh():
+                started = time.perf_counter()
+                try:
+                    spectrum = self.processor.process(samples, channel_count, sample_rate)
+                except Exception as e:
+                    print(f"Error analysing audio buffer: {str(e)}")
+                    continue
+                if spectrum is None:
+                    continue
+                finished = time.perf_counter()
+                sequence = self.frames + 1
+                self._latest = (spectrum.copy(), sample_rate, sequence)
+                self.frames = sequence
+                self.analysis_total += finished - started
+                latency = finished - queued_at
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+
+    def _post_latest(self):
+        latest = self._latest
+        if latest is not None and latest[2] != self._posted_sequence:
+            self._posted_sequence = latest[2]
+            self.spectrum_ready.emit(latest[0], latest[1])
@@ -0,0 +1,61 @@
+import numpy as np
+from PyQt5.QtMultimedia import QAudioBuffer, QAudioFormat
+
+# (sampleType, sampleSize) -> NumPy base type; 24-bit and unknown formats are not supported
+_SAMPLE_TYPES = {
+    (QAudioFormat.SignedInt, 8): 'i1',
+    (QAudioFormat.SignedInt, 16): 'i2',
+    (QAudioFormat.SignedInt, 32): 'i4',
+    (QAudioFormat.UnSignedInt, 8): 'u1',
+    (QAudioFormat.UnSignedInt, 16): 'u2',
+    (QAudioFormat.UnSignedInt, 32): 'u4',
+    (QAudioFormat.Float, 32): 'f4',
+    (QAudioFormat.Float, 64): 'f8',
+}
+
+def sample_dtype(audio_format):
+    """NumPy dtype of one sample in audio_format, or None when it has no NumPy equivalent"""
+    code = _SAMPLE_TYPES.get((audio_format.sampleType(), audio_format.sampleSize()))
+    if code is None:
+        return None
+    order = '>' if audio_format.byteOrder() == QAudioFormat.BigEndian else '<'
+    return np.dtype(order + code)
+
+class _RetainedBuffer:
+    """Array-interface wrapper that keeps the QAudioBuffer alive as long as a view of it exists"""
+
+    def __init__(self, buffer, address, dtype, count):
+        self.buffer = buffer
+        self.__array_interface__ = {
+            'version': 3,
+            'data': (address, True),  # Read-only: the memory belongs to Qt
+            'shape': (count,),
+            'typestr': dtype.str,
+        }
+
+def audio_buffer_array(buffer, copy=False):
+    """Interleaved samples of a QAudioBuffer as a 1-D NumPy array, or None if unsupported.
+
+    By default the array is a read-only view of the buffer's own memory.
+    It holds a shared copy of the QAudioBuffer (which is implicitly shared,
+    so this costs a reference, not the samples), so the view stays valid
+    after the probe callback returns, including on another thread. Pass
+    copy=True when the backend's memory may be reused behind the buffer.
+    """
+    audio_format = buffer.format()
+    dtype = sample_dtype(audio_format)
+    if dtype is None or audio_format.channelCount() <= 0:
+        return None
+    count = buffer.byteCount() // dtype.itemsize
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+
+    retained = QAudioBuffer(buffer)
+    pointer = retained.constData()
+    if pointer is None or int(pointer) == 0:
+        return None
+    view = np.asarray(_RetainedBuffer(retained, int(pointer), dtype, count))
+    if copy:
+        # Fallback: a single copy straight out of Qt's memory, no intermediate bytes object
+        return view.copy()
+    return view
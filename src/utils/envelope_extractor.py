@@ -0,0 +1,137 @@
+import math
+import numpy as np
+import soundfile as sf
+import audioread
+from ..config import Config
+
+class EnvelopeExtractor:
+    """Block-streaming reduction of audio to per-bucket min/max/RMS.
+
+    Samples are fed in fixed-size blocks and folded into running bucket
+    accumulators, so peak memory depends on the block size only, never on
+    the duration of the file.
+    """
+    BLOCK_FRAMES = 65536
+
+    def __init__(self, total_frames, points=Config.WAVEFORM_RESOLUTION):
+        total_frames = max(int(total_frames), 1)
+        self.points = max(min(int(points), total_frames), 1)
+        self.samples_per_bucket = math.ceil(total_frames / self.points)
+        self._envelope = np.zeros((self.points, 3), dtype=np.float32)
+        self._bucket = 0
+        self._position = 0
+        self._reset_partial()
+
+    def _reset_partial(self):
+        self._min = np.inf
+        self._max = -np.inf
+        self._sum_squares = 0.0
+        self._count = 0
+
+    def _close_partial(self):
+        if self._count == 0:
+            return
+        # A short frame-count estimate can overshoot; fold the excess into the last bucket
+        index = min(self._bucket, self.points - 1)
+        row = self._envelope[index]
+        if self._bucket >= self.points:
+            row[0] = min(row[0], self._min)
+            row[1] = max(row[1], self._max)
+            row[2] = max(row[2], math.sqrt(self._sum_squares / self._count))
+        else:
+            row[:] = (self._min, self._max, math.sqrt(self._sum_squares / self._count))
+            self._bucket += 1
+        self._reset_partial()
+
+    def feed(self, samples):
+        """Fold a block of mono float samples into the envelope"""
+        n = len(samples)
+        if n == 0:
+            return
+
+        # Split the block wherever a new bucket starts
+        spb = self.samples_per_bucket
+        first_boundary = (-self._position) % spb
+        starts = np.arange(first_boundary, n, spb)
+        if first_boundary != 0:
+            starts = np.concatenate(([0], starts))
+
+        mins = np.minimum.reduceat(samples, starts)
+        maxs = np.maximum.reduceat(samples, starts)
+        sum_squares = np.add.reduceat(np.square(samples, dtype=np.float64), starts)
+        counts = np.diff(np.append(starts, n))
+
+        for start, lo, hi, sq, count in zip(starts.tolist(), mins.tolist(), maxs.tolist(),
+                                             sum_squares.tolist(), counts.tolist()):
+            if (self._position + start) % spb == 0:
+                self._close_partial()
+            self._min = min(self._min, lo)
+            self._max = max(self._max, hi)
+            self._sum_squares += sq
+            self._count += count
+
+        self._position += n
+
+    def finish(self):
+        """Close the last bucket and return the (buckets x 3) min/max/RMS envelope"""
+        self._close_partial()
+        return self._envelope[:min(self._bucket, self.points)].copy()
+
+    @staticmethod
+    def extract(audio_path, points=Config.WAVEFORM_RESOLUTION, block_frames=BLOCK_FRAMES):
+        """Stream an audio file from disk and return its min/max/RMS envelope"""
+        try:
+            return EnvelopeExtractor._extract_soundfile(audio_path, points, block_frames)
+        except RuntimeError:
+            # libsndfile cannot open every container (e.g. older builds lack MP3)
+            return EnvelopeExtractor._extract_audioread(audio_path, points, block_frames)
+
+    @staticmethod
+    def _extract_soundfile(audio_path, points, block_frames):
+        with sf.SoundFile(audio_path) as audio_file:
+            if audio_file.frames <= 0:
+                return None
+            extractor = EnvelopeExtractor(audio_file.frames, points)
+            block = np.empty((block_frames, audio_file.channels), dtype=np.float32)
+            mono = np.empty(block_frames, dtype=np.float32)
+            while True:
+                read = audio_file.read(out=block)
+                frames = len(read)
+                if frames == 0:
+                    break
+                np.mean(read, axis=1, out=mono[:frames])
+                extractor.feed(mono[:frames])
+                if frames < block_frames:
+                    break
+        return extractor.finish()
+
+    @staticmethod
+    def _extract_audioread(audio_path, points, block_frames):
+        with audioread.audio_open(audio_path) as audio_file:
+            channels = max(audio_file.channels, 1)
+            total_frames = int(audio_file.duration * audio_file.samplerate)
+            if total_frames <= 0:
+                return None
+            extractor = EnvelopeExtractor(total_frames, points)
+
+            # Decoders hand out small buffers; batch them into full blocks before reducing
+            block_bytes = block_frames * channels * 2
+            pending = []
+            pending_bytes = 0
+            for buffer in audio_file:
+                pending.append(buffer)
+                pending_bytes += len(buffer)
+                if pending_bytes >= block_bytes:
+                    EnvelopeExtractor._feed_pcm(extractor, b''.join(pending), channels)
+                    pending = []
+                    pending_bytes = 0
+            if pending:
+                EnvelopeExtractor._feed_pcm(extractor, b''.join(pending), channels)
+        return extractor.finish()
+
+    @staticmethod
+    def _feed_pcm(extractor, data, channels):
+        """Feed interleaved signed 16-bit PCM, downmixed to mono"""
+        samples = np.frombuffer(data, dtype='<i2')
+        samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+        extractor.feed(samples.mean(axis=1, dtype=np.float32) / 32768.0)
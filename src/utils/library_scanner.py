@@ -0,0 +1,262 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from sqlalchemy import or_
+from ..config import Config
+from ..database import SessionLocal
+from ..database.models import Media
+from .metadata_extractor import MetadataExtractor
+
+class LibraryScanner:
+    """Recursive folder scanner that imports media files in bulk.
+
+    Directories are walked with os.scandir and every file's (size, mtime_ns,
+    inode) fingerprint is compared with the one stored on its Media row.
+    Metadata is only extracted, on a process pool, for new or modified
+    files; rows are written with bulk insert/update mappings in large
+    transactions. Files that disappeared are marked missing, and a new path
+    with the fingerprint of a missing file is treated as a move so the row
+    keeps its play statistics, tags and playlists.
+    """
+
+    @staticmethod
+    def iter_media_files(root, failed_dirs=None):
+        """Yield DirEntry objects of supported media files below root.
+
+        Symlinked directories are not followed. Directories that cannot be
+        read are appended to failed_dirs when given.
+        """
+        extensions = tuple(ext.lower() for ext in Config.SUPPORTED_FORMATS)
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.name.lower().endswith(extensions) and entry.is_file():
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"Error scanning {directory}: {str(e)}")
+                if failed_dirs is not None:
+                    failed_dirs.append(directory)
+
+    @staticmethod
+    def fingerprint(stat_result):
+        return (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+
+    @staticmethod
+    def to_row(metadata, fingerprint, created_date=None):
+        """Media row mapping for bulk_insert_mappings (or, without created_date, an update)"""
+        row = {
+            'file_path': metadata['file_path'],
+            'title': metadata['title'],
+            'artist': metadata['artist'],
+            'album': metadata['album'],
+            'duration': metadata['duration'],
+            'media_type': metadata['media_type'],
+            'file_size': fingerprint[0],
+            'file_mtime_ns': fingerprint[1],
+            'file_inode': fingerprint[2],
+            'is_missing': False,
+        }
+        if created_date is not None:
+            row.update({
+                'created_date': created_date,
+                'play_count': 0,
+                'is_favorite': False,
+                'total_play_time': 0,
+            })
+        return row
+
+    @staticmethod
+    def _known_files(db, roots):
+        """{file_path: (id, fingerprint, is_missing)} for library rows under the scanned roots"""
+        prefixes = [root.rstrip(os.sep) + os.sep for root in roots]
+        query = db.query(Media.id, Media.file_path, Media.file_size, Media.file_mtime_ns,
+                         Media.file_inode, Media.is_missing)
+        query = query.filter(or_(*(Media.file_path.startswith(prefix, autoescape=True) for prefix in prefixes)))
+        return {
+            file_path: (media_id, (size, mtime_ns, inode), bool(is_missing))
+            for media_id, file_path, size, mtime_ns, inode, is_missing in query
+        }
+
+    WALK = 'walk'
+    IMPORT = 'import'
+
+    @staticmethod
+    def scan(roots, workers=None, batch_size=None, progress_callback=None, is_cancelled=None):
+        """Scan folders and bring the library in line with them.
+
+        progress_callback(phase, processed, total, files_per_second) is called
+        at most every Config.SCAN_PROGRESS_INTERVAL_MS: during the WALK phase
+        processed counts files found (total is 0, still unknown), during the
+        IMPORT phase it counts files whose metadata was extracted.
+        is_cancelled() is polled as often. Returns a summary dict whose
+        files_per_second is the overall rate of files examined.
+        """
+        if isinstance(roots, str):
+            roots = [roots]
+        roots = [os.path.abspath(root) for root in roots]
+        workers = workers or Config.SCAN_WORKERS
+        batch_size = batch_size or Config.SCAN_BATCH_SIZE
+        started = time.perf_counter()
+        interval = Config.SCAN_PROGRESS_INTERVAL_MS / 1000
+        next_report = started + interval
+
+        def report(phase, processed, total, phase_started):
+            if progress_callback:
+                elapsed = time.perf_counter() - phase_started
+                progress_callback(phase, processed, total, processed / elapsed if elapsed > 0 else 0.0)
+
+        db = SessionLocal()
+        try:
+            # Walk and stat; this is all an unchanged library costs
+            on_disk = {}
+            failed_dirs = []
+            for root in roots:
+                for entry in LibraryScanner.iter_media_files(root, failed_dirs):
+                    try:
+                        on_disk[entry.path] = LibraryScanner.fingerprint(entry.stat())
+                    except OSError:
+                        continue
+                    if time.perf_counter() >= next_report:
+                        next_report = time.perf_counter() + interval
+                        report(LibraryScanner.WALK, len(on_disk), 0, started)
+                        if is_cancelled and is_cancelled():
+                            # A partial walk must not be diffed: files not reached yet would look deleted
+                            return LibraryScanner._summary(len(on_disk), cancelled=True, started=started)
+            report(LibraryScanner.WALK, len(on_disk), 0, started)
+
+            known = LibraryScanner._known_files(db, roots)
+            unreadable = tuple(directory.rstrip(os.sep) + os.sep for directory in failed_dirs)
+
+            new_paths = []
+            modified = []  # (id, file_path)
+            flag_updates = []  # is_missing / file_path changes that need no extraction
+            unchanged = 0
+            for file_path, fingerprint in on_disk.items():
+                entry = known.get(file_path)
+                if entry is None:
+                    new_paths.append(file_path)
+                elif entry[1] != fingerprint:
+                    modified.append((entry[0], file_path))
+                else:
+                    unchanged += 1
+                    if entry[2]:
+                        flag_updates.append({'id': entry[0], 'is_missing': False})
+
+            # Rows whose file is gone, unless its directory just could not be read
+            missing = {
+                entry[0]: entry[1] for file_path, entry in known.items()
+                if file_path not in on_disk and not entry[2]
+                and not (unreadable and file_path.startswith(unreadable))
+            }
+            # A new path carrying the fingerprint of a vanished file is a move or rename
+            vanished = {entry[1]: entry[0] for file_path, entry in known.items()
+                        if file_path not in on_disk and entry[2]}
+            vanished.update((fingerprint, media_id) for media_id, fingerprint in missing.items())
+
+            moved = 0
+            remaining_new = []
+            for file_path in new_paths:
+                fingerprint = on_disk[file_path]
+                media_id = vanished.pop(fingerprint, None) if fingerprint[2] else None
+                if media_id is not None:
+                    missing.pop(media_id, None)
+                    flag_updates.append({'id': media_id, 'file_path': file_path, 'is_missing': False})
+                    moved += 1
+                else:
+                    remaining_new.append(file_path)
+            new_paths = remaining_new
+            flag_updates.extend({'id': media_id, 'is_missing': True} for media_id in missing)
+
+            for start in range(0, len(flag_updates), batch_size):
+                db.bulk_update_mappings(Media, flag_updates[start:start + batch_size])
+                db.commit()
+
+            # Only new and modified files are parsed
+            to_extract = new_paths + [file_path for _, file_path in modified]
+            modified_ids = {file_path: media_id for media_id, file_path in modified}
+            total = len(to_extract)
+            added = 0
+            updated = 0
+            processed = 0
+            cancelled = False
+            inserts = []
+            updates = []
+            created_date = datetime.now()
+
+            def commit_batch():
+                if inserts:
+                    db.bulk_insert_mappings(Media, inserts)
+                if updates:
+                    db.bulk_update_mappings(Media, updates)
+                db.commit()
+                inserts.clear()
+                updates.clear()
+
+            if to_extract:
+                # Spawned workers: forking a process that runs Qt threads is unsafe
+                context = multiprocessing.get_context('spawn')
+                chunksize = max(1, min(256, total // (workers * 4) or 1))
+                executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+                extract_started = time.perf_counter()
+                try:
+                    for file_path, metadata in zip(to_extract, executor.map(
+                            MetadataExtractor.extract_metadata, to_extract, chunksize=chunksize)):
+                        processed += 1
+                        # Keep the scanned path as the key so the next diff matches it exactly
+                        metadata['file_path'] = file_path
+                        media_id = modified_ids.get(file_path)
+                        if media_id is None:
+                            inserts.append(LibraryScanner.to_row(metadata, on_disk[file_path], created_date))
+                            added += 1
+                        else:
+                            row = LibraryScanner.to_row(metadata, on_disk[file_path])
+                            row['id'] = media_id
+                            updates.append(row)
+                            updated += 1
+                        if len(inserts) + len(updates) >= batch_size:
+                            commit_batch()
+                        if time.perf_counter() >= next_report:
+                            next_report = time.perf_counter() + interval
+                            report(LibraryScanner.IMPORT, processed, total, extract_started)
+                        if is_cancelled and is_cancelled():
+                            cancelled = True
+                            break
+                finally:
+                    executor.shutdown(wait=not cancelled, cancel_futures=cancelled)
+
+                commit_batch()
+                report(LibraryScanner.IMPORT, processed, total, extract_started)
+
+            return LibraryScanner._summary(len(on_disk), added, updated, moved, len(missing), unchanged,
+                                           cancelled, started)
+        except Exception as e:
+            db.rollback()
+            print(f"Error scanning library: {str(e)}")
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _summary(found, added=0, updated=0, moved=0, missing=0, unchanged=0, cancelled=False, started=None):
+        elapsed = time.perf_counter() - started
+        return {
+            'found': found,
+            'added': added,
+            'updated': updated,
+            'moved': moved,
+            'missing': missing,
+            'unchanged': unchanged,
+            'cancelled': cancelled,
+            'elapsed': elapsed,
+            'files_per_second': found / elapsed if elapsed > 0 else 0.0,
+        }
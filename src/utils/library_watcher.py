@@ -0,0 +1,344 @@
+import os
+import threading
+import time
+from datetime import datetime
+from PyQt5.QtCore import QObject, pyqtSignal
+from sqlalchemy import text
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+from ..config import Config
+from ..database import SessionLocal
+from ..database.models import Media
+from .library_scanner import LibraryScanner
+from .metadata_extractor import MetadataExtractor
+
+class _MediaEventHandler(FileSystemEventHandler):
+    """Forward watchdog events to the watcher's coalescing queue"""
+    def __init__(self, watcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        self.watcher.queue_upsert(event.src_path, event.is_directory, created=True)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.queue_upsert(event.src_path, False)
+
+    def on_deleted(self, event):
+        self.watcher.queue_delete(event.src_path, event.is_directory)
+
+    def on_moved(self, event):
+        self.watcher.queue_move(event.src_path, event.dest_path, event.is_directory)
+
+class LibraryWatcher(QObject):
+    """Watch media roots and mirror file changes into the Media table.
+
+    Filesystem events are coalesced per path (the last event wins) and
+    applied on a background thread once the roots have been quiet for
+    Config.WATCH_QUIET_MS, or at the latest Config.WATCH_MAX_DELAY_MS after
+    the first pending event. Each applied batch runs in one transaction
+    and emits library_changed once, so a 2,000-file copy produces a
+    handful of notifications instead of thousands.
+    """
+    library_changed = pyqtSignal(dict)  # batch summary
+
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+
+    def __init__(self, roots=None, parent=None):
+        super().__init__(parent)
+        self.roots = [os.path.abspath(root) for root in (roots if roots is not None else Config.MEDIA_ROOTS)]
+        self._extensions = tuple(ext.lower() for ext in Config.SUPPORTED_FORMATS)
+        self._observer = None
+        self._thread = None
+        self._condition = threading.Condition()
+        self._stopping = False
+        # Pending work, guarded by _condition
+        self._files = {}  # file_path -> UPSERT / DELETE
+        self._created = set()  # files created in this batch, so not in the library yet
+        self._moves = []  # (src, dest, is_directory), applied before the per-file actions
+        self._scan_dirs = set()  # directories that appeared and must be walked
+        self._deleted_dirs = set()
+        self._first_event = None
+        self._last_event = None
+        self._failures = 0  # Consecutive failed batches
+
+    def start(self):
+        roots = [root for root in self.roots if os.path.isdir(root)]
+        if not roots:
+            return False
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="LibraryWatcher", daemon=True)
+        self._thread.start()
+        self._observer = Observer()
+        handler = _MediaEventHandler(self)
+        for root in roots:
+            self._observer.schedule(handler, root, recursive=True)
+        self._observer.start()
+        return True
+
+    def stop(self):
+        """Stop watching and apply whatever is still pending"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            with self._condition:
+                self._stopping = True
+                self._condition.notify()
+            self._thread.join()
+            self._thread = None
+
+    def _is_media(self, path):
+        return path.lower().endswith(self._extensions)
+
+    def _touch(self):
+        now = time.monotonic()
+        if self._first_event is None:
+            self._first_event = now
+        self._last_event = now
+        self._condition.notify()
+
+    def queue_upsert(self, path, is_directory, created=False):
+        with self._condition:
+            if is_directory:
+                self._scan_dirs.add(path)
+            elif self._is_media(path):
+                self._files[path] = self.UPSERT
+                if created:
+                    self._created.add(path)
+            else:
+                return
+            self._touch()
+
+    def queue_delete(self, path, is_directory):
+        with self._condition:
+            if is_directory:
+                self._deleted_dirs.add(path)
+                self._scan_dirs.discard(path)
+            elif self._is_media(path):
+                self._files[path] = self.DELETE
+                self._created.discard(path)
+            else:
+                return
+            self._touch()
+
+    def queue_move(self, src, dest, is_directory):
+        with self._condition:
+            if not is_directory and not (self._is_media(src) or self._is_media(dest)):
+                return
+            if is_directory:
+                # Pending work below the directory now lives below its new path
+                prefix = src.rstrip(os.sep) + os.sep
+                for directory in [d for d in self._scan_dirs if d == src or d.startswith(prefix)]:
+                    self._scan_dirs.discard(directory)
+                    self._scan_dirs.add(dest + directory[len(src):])
+                for path in [p for p in self._files if p.startswith(prefix)]:
+                    self._files[dest + path[len(src):]] = self._files.pop(path)
+                for path in [p for p in self._created if p.startswith(prefix)]:
+                    self._created.discard(path)
+                    self._created.add(dest + path[len(src):])
+                self._moves.append((src, dest, is_directory))
+            elif src in self._created:
+                # Created and moved within one batch: only the destination matters
+                self._created.discard(src)
+                self._files.pop(src, None)
+                if self._is_media(dest):
+                    self._files[dest] = self.UPSERT
+                    self._created.add(dest)
+            else:
+                # A known file (possibly modified first) keeps its row: move it
+                self._moves.append((src, dest, is_directory))
+            self._touch()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._first_event is not None:
+                        now = time.monotonic()
+                        quiet_left = self._last_event + Config.WATCH_QUIET_MS / 1000 - now
+                        max_left = self._first_event + Config.WATCH_MAX_DELAY_MS / 1000 - now
+                        wait = min(quiet_left, max_left)
+                        if wait <= 0 or self._stopping:
+                            break
+                        self._condition.wait(wait)
+                    elif self._stopping:
+                        return
+                    else:
+                        self._condition.wait()
+                batch = self._take_batch()
+
+            try:
+                summary = self._apply_batch(batch)
+                self._failures = 0
+                if any(summary.values()):
+                    self.library_changed.emit(summary)
+            except Exception as e:
+                print(f"Error applying library changes: {str(e)}")
+                self._requeue(batch)
+
+    def _take_batch(self):
+        """Hand over the pending work and start an empty batch; the caller holds _condition"""
+        batch = {
+            'files': self._files,
+            'moves': self._moves,
+            'scan_dirs': self._scan_dirs,
+            'deleted_dirs': self._deleted_dirs,
+            'created': self._created,
+        }
+        self._files, self._moves, self._scan_dirs, self._deleted_dirs = {}, [], set(), set()
+        self._created = set()
+        self._first_event = self._last_event = None
+        return batch
+
+    def _requeue(self, batch):
+        """Put a failed batch back in front of newer events so it is retried with the next batch"""
+        with self._condition:
+            self._failures += 1
+            if self._failures > Config.WATCH_MAX_RETRIES:
+                print(f"Dropping library changes after {self._failures - 1} retries")
+                self._failures = 0
+                return
+            files = dict(batch['files'])
+            files.update(self._files)  # Newer events for the same path win
+            self._files = files
+            self._moves = batch['moves'] + self._moves
+            self._scan_dirs |= batch['scan_dirs']
+            self._deleted_dirs |= batch['deleted_dirs']
+            self._created |= batch['created']
+            self._touch()
+
+    def _apply_batch(self, batch):
+        """Apply one coalesced batch of changes in a single transaction"""
+        summary = {'added': 0, 'updated': 0, 'moved': 0, 'missing': 0}
+        files = dict(batch['files'])
+        for directory in batch['scan_dirs']:
+            for entry in LibraryScanner.iter_media_files(directory):
+                files.setdefault(entry.path, self.UPSERT)
+
+        db = SessionLocal()
+        try:
+            for src, dest, is_directory in batch['moves']:
+                summary['moved'] += self._apply_move(db, src, dest, is_directory, files)
+
+            for directory in batch['deleted_dirs']:
+                summary['missing'] += db.execute(text(
+                    "UPDATE media SET is_missing = 1 "
+                    "WHERE file_path >= :prefix AND file_path < :prefix_end AND NOT is_missing"
+                ), self._prefix_range(directory)).rowcount
+
+            deleted = [path for path, action in files.items() if action == self.DELETE]
+            if deleted:
+                summary['missing'] += db.query(Media).filter(Media.file_path.in_(deleted), Media.is_missing == False) \
+                    .update({Media.is_missing: True}, synchronize_session=False)
+
+            upserts = [path for path, action in files.items() if action == self.UPSERT]
+            if upserts:
+                added, updated = self._apply_upserts(db, upserts)
+                summary['added'] += added
+                summary['updated'] += updated
+
+            db.commit()
+            return summary
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _prefix_range(directory):
+        """Exact, case-sensitive bounds of the paths below directory (LIKE ignores ASCII case)"""
+        prefix = directory.rstrip(os.sep) + os.sep
+        # The separator is the last character, so bumping it bounds every path that starts with prefix
+        return {'prefix': prefix, 'prefix_end': prefix[:-1] + chr(ord(prefix[-1]) + 1)}
+
+    def _apply_move(self, db, src, dest, is_directory, files):
+        if is_directory:
+            return self._apply_directory_move(db, src, dest, files)
+
+        media = db.query(Media).filter(Media.file_path == src).first()
+        dest_known = db.query(Media.id).filter(Media.file_path == dest).first() is not None
+        if media is None or not self._is_media(dest) or dest_known:
+            # Replacing a known file keeps the destination's row: the move becomes delete(src) + upsert(dest)
+            if media is not None:
+                media.is_missing = True
+            if self._is_media(dest):
+                files[dest] = self.UPSERT
+            return 0
+        media.file_path = dest
+        media.is_missing = False
+        db.flush()
+        # Pick up the new fingerprint (and any content change) with the other upserts
+        files.setdefault(dest, self.UPSERT)
+        return 1
+
+    def _apply_directory_move(self, db, src, dest, files):
+        """Rewrite the path prefix of every row below a moved directory"""
+        params = self._prefix_range(src)
+        params.update({
+            'dest': dest.rstrip(os.sep) + os.sep,
+            'offset': len(params['prefix']) + 1,
+        })
+        # Rows whose new path is already taken are handled like single-file replacements
+        replaced = db.execute(text(
+            "SELECT :dest || substr(file_path, :offset) FROM media "
+            "WHERE file_path >= :prefix AND file_path < :prefix_end "
+            "AND EXISTS (SELECT 1 FROM media AS taken WHERE taken.file_path = :dest || substr(media.file_path, :offset))"
+        ), params).scalars().all()
+        if replaced:
+            db.execute(text(
+                "UPDATE media SET is_missing = 1 WHERE file_path >= :prefix AND file_path < :prefix_end "
+                "AND EXISTS (SELECT 1 FROM media AS taken WHERE taken.file_path = :dest || substr(media.file_path, :offset))"
+            ), params)
+            for path in replaced:
+                files[path] = self.UPSERT
+        return db.execute(text(
+            "UPDATE media SET file_path = :dest || substr(file_path, :offset) "
+            "WHERE file_path >= :prefix AND file_path < :prefix_end "
+            "AND NOT EXISTS (SELECT 1 FROM media AS taken WHERE taken.file_path = :dest || substr(media.file_path, :offset))"
+        ), params).rowcount
+
+    def _apply_upserts(self, db, paths):
+        """Insert new files and refresh changed ones, skipping unchanged fingerprints"""
+        fingerprints = {}
+        for path in paths:
+            try:
+                fingerprints[path] = LibraryScanner.fingerprint(os.stat(path))
+            except OSError:
+                continue  # Vanished again before the batch was applied
+
+        known = {}
+        paths = list(fingerprints)
+        for start in range(0, len(paths), 500):
+            rows = db.query(Media.id, Media.file_path, Media.file_size, Media.file_mtime_ns,
+                            Media.file_inode, Media.is_missing) \
+                .filter(Media.file_path.in_(paths[start:start + 500]))
+            for media_id, file_path, size, mtime_ns, inode, is_missing in rows:
+                known[file_path] = (media_id, (size, mtime_ns, inode), is_missing)
+
+        inserts, updates = [], []
+        created_date = datetime.now()
+        for path, fingerprint in fingerprints.items():
+            entry = known.get(path)
+            if entry is not None and entry[1] == fingerprint:
+                if entry[2]:
+                    updates.append({'id': entry[0], 'is_missing': False})
+                continue
+            metadata = MetadataExtractor.extract_metadata(path)
+            metadata['file_path'] = path
+            if entry is None:
+                inserts.append(LibraryScanner.to_row(metadata, fingerprint, created_date))
+            else:
+                row = LibraryScanner.to_row(metadata, fingerprint)
+                row['id'] = entry[0]
+                updates.append(row)
+
+        if inserts:
+            db.bulk_insert_mappings(Media, inserts)
+        if updates:
+            db.bulk_update_mappings(Media, updates)
+        return len(inserts), len(updates)
@@ -0,0 +1,70 @@
+from datetime import datetime
+from PyQt5.QtCore import QObject
+from PyQt5.QtMultimedia import QMediaPlayer
+from ..config import Config
+
+class ListeningTracker(QObject):
+    """Measure how long each track is actually listened to.
+
+    Only forward position steps of at most Config.LISTEN_MAX_STEP_MS made
+    while the player is playing count, so pauses, seeks and skips add
+    nothing. Listened seconds are handed to the stats write queue every
+    Config.LISTEN_FLUSH_SECONDS rather than per position tick, and each
+    session (track change or stop) is logged as one play event.
+    """
+
+    def __init__(self, player, stats_writer, parent=None):
+        super().__init__(parent)
+        self.stats_writer = stats_writer
+        self.file_path = None
+        self.started_at = None  # Start of the current session, None while no session is open
+        self.session_seconds = 0.0
+        self.unflushed_seconds = 0.0  # Not yet handed to the write queue
+        self._playing = False
+        self._position = None
+        player.positionChanged.connect(self.on_position_changed)
+        player.stateChanged.connect(self.on_state_changed)
+        player.currentMediaChanged.connect(self.on_media_changed)
+
+    def on_media_changed(self, media):
+        self.end_session()
+        url = media.canonicalUrl()
+        self.file_path = url.toLocalFile() if url.isLocalFile() else None
+        self._position = None
+
+    def on_state_changed(self, state):
+        self._playing = state == QMediaPlayer.PlayingState
+        if state == QMediaPlayer.StoppedState:
+            self.end_session()
+        # Resume counting from the next position report
+        self._position = None
+
+    def on_position_changed(self, position):
+        previous, self._position = self._position, position
+        if not self._playing or self.file_path is None or previous is None:
+            return
+        step = position - previous
+        if step <= 0 or step > Config.LISTEN_MAX_STEP_MS:
+            return  # Seek, skip or restart
+        if self.started_at is None:
+            self.started_at = datetime.now()
+        seconds = step / 1000
+        self.session_seconds += seconds
+        self.unflushed_seconds += seconds
+        if self.unflushed_seconds >= Config.LISTEN_FLUSH_SECONDS:
+            self._flush_seconds()
+
+    def _flush_seconds(self):
+        self.stats_writer.add_play_time(self.file_path, self.unflushed_seconds)
+        self.unflushed_seconds = 0.0
+
+    def end_session(self):
+        """Close the current session and queue its play event"""
+        if self.started_at is None:
+            return
+        self._flush_seconds()
+        if self.session_seconds >= Config.LISTEN_MIN_EVENT_SECONDS:
+            self.stats_writer.record_play_event(self.file_path, self.started_at, datetime.now(),
+                                                self.session_seconds)
+        self.started_at = None
+        self.session_seconds = 0.0
@@ -0,0 +1,115 @@
+from mutagen import File
+from mutagen.mp3 import MP3
+from mutagen.wave import WAVE
+from pathlib import Path
+import cv2
+from .metadata_extractor import MetadataExtractor
+
+class MediaProbe:
+    """Header-only media inspection.
+
+    Tags and technical details (duration, sample rate, channels, bitrate,
+    codec) are read from container headers with a single mutagen open;
+    video dimensions come from OpenCV property reads. No samples or frames
+    are decoded.
+    """
+    VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv')
+
+    @staticmethod
+    def probe(file_path):
+        """Probe a media file, returning {'metadata': {...}, 'info': {...}}"""
+        is_video = Path(file_path).suffix.lower() in MediaProbe.VIDEO_EXTENSIONS
+        info = {}
+        media_file = None
+
+        try:
+            media_file = File(file_path)
+        except Exception as e:
+            print(f"Error probing {file_path}: {str(e)}")
+
+        metadata = MetadataExtractor.extract_from_file(file_path, media_file)
+        if media_file is not None and media_file.info is not None:
+            info.update(MediaProbe._read_stream_info(media_file))
+
+        if is_video:
+            # Container duration from mutagen is exact; frame count / fps is the fallback
+            video_info = MediaProbe._read_video_info(file_path)
+            duration = video_info.pop('duration', None)
+            info.update(video_info)
+            if duration and not info.get('duration'):
+                info['duration'] = duration
+
+        if info.get('duration') and not metadata['duration']:
+            metadata['duration'] = info['duration']
+
+        return {'metadata': metadata, 'info': info}
+
+    @staticmethod
+    def _read_stream_info(media_file):
+        stream = media_file.info
+        info = {}
+        if getattr(stream, 'length', None):
+            info['duration'] = float(stream.length)
+        if getattr(stream, 'sample_rate', None):
+            info['sample_rate'] = int(stream.sample_rate)
+        if getattr(stream, 'channels', None):
+            info['channels'] = int(stream.channels)
+        if getattr(stream, 'bitrate', None):
+            info['bitrate'] = int(stream.bitrate)
+
+        if isinstance(media_file, MP3):
+            info['codec'] = f"MPEG-{stream.version:g} Layer {stream.layer}"
+        elif isinstance(media_file, WAVE):
+            info['codec'] = f"PCM {stream.bits_per_sample}-bit"
+        elif getattr(stream, 'codec', None):
+            info['codec'] = getattr(stream, 'codec_description', None) or stream.codec
+        return info
+
+    @staticmethod
+    def _read_video_info(file_path):
+        """Read video stream properties; opening the capture parses headers only"""
+        info = {}
+        cap = cv2.VideoCapture(file_path)
+        try:
+            if not cap.isOpened():
+                return info
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+            fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+
+            if width and height:
+                info['resolution'] = f"{width}x{height}"
+            if fps:
+                info['fps'] = round(fps, 2)
+                if frame_count:
+                    info['duration'] = frame_count / fps
+            if fourcc:
+                codec = ''.join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip()
+                if codec.isprintable():
+                    info['codec'] = codec
+        finally:
+            cap.release()
+        return info
+
+    @staticmethod
+    def format_info(info):
+        """Format raw probe info into display strings"""
+        formatted = {}
+        if info.get('duration'):
+            duration = info['duration']
+            formatted['duration'] = f"{int(duration // 60)}:{int(duration % 60):02d}"
+        if info.get('resolution'):
+            formatted['resolution'] = info['resolution']
+        if info.get('fps'):
+            formatted['fps'] = info['fps']
+        if info.get('sample_rate'):
+            formatted['sample_rate'] = f"{info['sample_rate']} Hz"
+        if info.get('channels'):
+            formatted['channels'] = {1: 'Mono', 2: 'Stereo'}.get(info['channels'], f"{info['channels']} ch")
+        if info.get('bitrate'):
+            formatted['bitrate'] = f"{info['bitrate'] // 1000} kbps"
+        if info.get('codec'):
+            formatted['codec'] = info['codec']
+        return formatted
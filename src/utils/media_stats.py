@@ -1,66 +1,149 @@
+import numpy as np
+from ..database.models import Media
+
 class MediaStats:
+    """Per-file play statistics stored column-wise in NumPy arrays.
+
+    Each file path maps to a row; play_count (int32), rating (int8),
+    is_favorite (bool) and last_played (float64 timestamp, NaN when never
+    played) take 14 bytes of column data per track; the path strings and
+    the path -> row dict cost more than the columns themselves. Top-K
+    queries partition instead of sorting every row. load_from_db() reads
+    all rows from the Media table in bulk; changes are written through
+    StatsWriteQueue, never from here.
+    """
+    _INITIAL_CAPACITY = 1024
+
     def __init__(self):
-        # Dictionary to store media statistics
-        # Key: file_path, Value: dict with stats
-        self._stats = {}
-    
+        # Key: file_path, Value: row in the column arrays
+        self._index = {}
+        self._paths = []
+        self._allocate(self._INITIAL_CAPACITY)
+
+    def _allocate(self, capacity):
+        self._play_count = np.zeros(capacity, dtype=np.int32)
+        self._rating = np.zeros(capacity, dtype=np.int8)
+        self._is_favorite = np.zeros(capacity, dtype=bool)
+        self._last_played = np.full(capacity, np.nan, dtype=np.float64)
+
+    def _grow(self, needed):
+        """Double the column capacity until `needed` rows fit"""
+        capacity = len(self._play_count)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        count = len(self._paths)
+        old = (self._play_count, self._rating, self._is_favorite, self._last_played)
+        self._allocate(capacity)
+        for new_column, old_column in zip((self._play_count, self._rating, self._is_favorite, self._last_played), old):
+            new_column[:count] = old_column[:count]
+
     def _init_media_entry(self, file_path):
-        """Initialize statistics for a new media file"""
-        if file_path not in self._stats:
-            self._stats[file_path] = {
-                'play_count': 0,
-                'is_favorite': False,
-                'rating': 0,  # 0-5 stars
-                'last_played': None
-            }
-    
-    def increment_play_count(self, file_path):
+        """Return the row of a media file, adding an empty one for a new file"""
+        row = self._index.get(file_path)
+        if row is None:
+            row = len(self._paths)
+            self._grow(row + 1)
+            self._index[file_path] = row
+            self._paths.append(file_path)
+        return row
+
+    def __len__(self):
+        return len(self._paths)
+
+    def increment_play_count(self, file_path, count=1):
         """Increment the play count for a media file"""
-        self._init_media_entry(file_path)
-        self._stats[file_path]['play_count'] += 1
-        return self._stats[file_path]['play_count']
-    
+        row = self._init_media_entry(file_path)
+        self._play_count[row] += count
+        return int(self._play_count[row])
+
     def set_favorite(self, file_path, is_favorite):
         """Set or unset favorite status for a media file"""
-        self._init_media_entry(file_path)
-        self._stats[file_path]['is_favorite'] = bool(is_favorite)
-        return self._stats[file_path]['is_favorite']
-    
+        row = self._init_media_entry(file_path)
+        self._is_favorite[row] = bool(is_favorite)
+        return bool(self._is_favorite[row])
+
     def set_rating(self, file_path, rating):
         """Set rating (0-5 stars) for a media file"""
         if not (0 <= rating <= 5):
             raise ValueError("Rating must be between 0 and 5")
-        self._init_media_entry(file_path)
-        self._stats[file_path]['rating'] = rating
-        return self._stats[file_path]['rating']
-    
+        row = self._init_media_entry(file_path)
+        self._rating[row] = rating
+        return int(self._rating[row])
+
     def update_last_played(self, file_path, timestamp):
         """Update the last played timestamp for a media file"""
-        self._init_media_entry(file_path)
-        self._stats[file_path]['last_played'] = timestamp
-    
+        row = self._init_media_entry(file_path)
+        self._last_played[row] = np.nan if timestamp is None else timestamp
+
+    def apply(self, file_path, change):
+        """Fold one change queued on the stats write queue into the columns"""
+        if change.get('plays'):
+            self.increment_play_count(file_path, change['plays'])
+        if 'last_played' in change:
+            self.update_last_played(file_path, change['last_played'].timestamp())
+        if 'rating' in change:
+            self.set_rating(file_path, change['rating'] or 0)
+        if 'is_favorite' in change:
+            self.set_favorite(file_path, change['is_favorite'])
+
+    def _row_stats(self, row):
+        last_played = self._last_played[row]
+        return {
+            'play_count': int(self._play_count[row]),
+            'is_favorite': bool(self._is_favorite[row]),
+            'rating': int(self._rating[row]),
+            'last_played': None if np.isnan(last_played) else float(last_played)
+        }
+
+    def _rows_stats(self, rows):
+        return {self._paths[row]: self._row_stats(row) for row in rows}
+
     def get_stats(self, file_path):
         """Get all statistics for a media file"""
-        self._init_media_entry(file_path)
-        return self._stats[file_path].copy()
-    
+        return self._row_stats(self._init_media_entry(file_path))
+
     def get_all_stats(self):
         """Get statistics for all media files"""
-        return self._stats.copy()
-    
+        return self._rows_stats(range(len(self._paths)))
+
     def get_most_played(self, limit=10):
         """Get the most played media files"""
-        sorted_items = sorted(
-            self._stats.items(),
-            key=lambda x: x[1]['play_count'],
-            reverse=True
-        )
-        return dict(sorted_items[:limit])
-    
+        count = len(self._paths)
+        if limit <= 0 or count == 0:
+            return {}
+        play_count = self._play_count[:count]
+        if limit < count:
+            # Partition out the limit-th highest count, then take rows above it plus the earliest ties
+            threshold = np.partition(play_count, count - limit)[count - limit]
+            above = np.flatnonzero(play_count > threshold)
+            ties = np.flatnonzero(play_count == threshold)[:limit - len(above)]
+            rows = np.concatenate((above, ties))
+        else:
+            rows = np.arange(count)
+        # Stable on rows in insertion order, so ties keep their old order
+        rows = rows[np.argsort(-play_count[rows], kind='stable')]
+        return self._rows_stats(rows.tolist())
+
     def get_favorites(self):
         """Get all favorite media files"""
-        return {k: v for k, v in self._stats.items() if v['is_favorite']}
-    
+        return self._rows_stats(np.flatnonzero(self._is_favorite[:len(self._paths)]).tolist())
+
     def get_rated(self, min_rating=1):
         """Get all media files with rating >= min_rating"""
-        return {k: v for k, v in self._stats.items() if v['rating'] >= min_rating}
\ No newline at end of file
+        return self._rows_stats(np.flatnonzero(self._rating[:len(self._paths)] >= min_rating).tolist())
+
+    def load_from_db(self, db):
+        """Replace every row with the statistics stored on the Media table"""
+        rows = db.query(Media.file_path, Media.play_count, Media.rating, Media.is_favorite, Media.last_played).all()
+        count = len(rows)
+        self._paths = [row[0] for row in rows]
+        self._index = {file_path: row for row, file_path in enumerate(self._paths)}
+        self._allocate(max(self._INITIAL_CAPACITY, count))
+        self._play_count[:count] = np.fromiter((row[1] or 0 for row in rows), dtype=np.int32, count=count)
+        self._rating[:count] = np.fromiter((row[2] or 0 for row in rows), dtype=np.int8, count=count)
+        self._is_favorite[:count] = np.fromiter((bool(row[3]) for row in rows), dtype=bool, count=count)
+        self._last_played[:count] = np.fromiter(
+            (row[4].timestamp() if row[4] is not None else np.nan for row in rows), dtype=np.float64, count=count)
+        return count
@@ -7,6 +7,16 @@ from pathlib import Path
 class MetadataExtractor:
     @staticmethod
     def extract_metadata(file_path):
+        try:
+            media_file = File(file_path)
+        except Exception as e:
+            print(f"Error extracting metadata from {file_path}: {str(e)}")
+            media_file = None
+        return MetadataExtractor.extract_from_file(file_path, media_file)
+
+    @staticmethod
+    def extract_from_file(file_path, media_file):
+        """Build the metadata dict from an already opened mutagen file (or None)"""
         path = Path(file_path)
         file_type = path.suffix.lower()
         metadata = {
@@ -18,11 +28,10 @@ class MetadataExtractor:
             'media_type': 'video' if file_type in ['.mp4', '.avi', '.mkv'] else 'audio'
         }
 
-        try:
-            media_file = File(file_path)
-            if media_file is None:
-                return metadata
+        if media_file is None:
+            return metadata
 
+        try:
             if isinstance(media_file, MP3):
                 metadata.update(MetadataExtractor._extract_mp3_metadata(media_file))
             elif isinstance(media_file, MP4):
@@ -0,0 +1,74 @@
+from PyQt5.QtCore import QObject, QUrl
+from PyQt5.QtMultimedia import QMediaContent
+
+class PlaylistIndex(QObject):
+    """URL -> position map kept in step with a QMediaPlaylist.
+
+    The map follows the playlist's mediaInserted/mediaRemoved signals, so
+    membership and position lookups are dictionary hits instead of scans
+    over canonicalUrl(). Appends only index the new rows; inserting or
+    removing in the middle re-indexes the rows after that point. A URL
+    queued more than once maps to its first position.
+    """
+
+    def __init__(self, playlist, parent=None):
+        super().__init__(parent)
+        self.playlist = playlist
+        self._keys = []  # URL key per playlist position
+        self._positions = {}  # URL key -> first position
+        playlist.mediaInserted.connect(self.on_media_inserted)
+        playlist.mediaRemoved.connect(self.on_media_removed)
+        self.on_media_inserted(0, playlist.mediaCount() - 1)
+
+    @staticmethod
+    def key(file_path):
+        return QUrl.fromLocalFile(file_path).toString()
+
+    def _media_key(self, position):
+        return self.playlist.media(position).canonicalUrl().toString()
+
+    def _reindex_from(self, start):
+        for key in {key for key, position in self._positions.items() if position >= start}:
+            del self._positions[key]
+        for position in range(start, len(self._keys)):
+            self._positions.setdefault(self._keys[position], position)
+
+    def on_media_inserted(self, start, end):
+        if end < start:
+            return
+        appended = start == len(self._keys)
+        self._keys[start:start] = [self._media_key(position) for position in range(start, end + 1)]
+        if appended:
+            for position in range(start, end + 1):
+                self._positions.setdefault(self._keys[position], position)
+        else:
+            self._reindex_from(start)
+
+    def on_media_removed(self, start, end):
+        del self._keys[start:end + 1]
+        self._reindex_from(start)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, file_path):
+        return self.key(file_path) in self._positions
+
+    def index_of(self, file_path):
+        """Playlist position of a file, or -1 when it is not queued"""
+        return self._positions.get(self.key(file_path), -1)
+
+    def enqueue(self, file_paths):
+        """Append the files that are not queued yet with one addMedia call; returns how many were added"""
+        contents = []
+        seen = set()
+        for file_path in file_paths:
+            url = QUrl.fromLocalFile(file_path)
+            key = url.toString()
+            if key in self._positions or key in seen:
+                continue
+            seen.add(key)
+            contents.append(QMediaContent(url))
+        if contents:
+            self.playlist.addMedia(contents)
+        return len(contents)
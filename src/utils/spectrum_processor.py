@@ -0,0 +1,133 @@
+import numpy as np
+from ..config import Config
+
+class SpectrumProcessor:
+    """Turn a stream of interleaved PCM buffers into dB magnitude spectra.
+
+    Buffers of any length are mixed down to mono and appended to a ring
+    buffer; every Config.SPECTRUM_HOP_SIZE samples the latest
+    Config.SPECTRUM_FFT_SIZE samples are windowed (Hann, cached) and run
+    through rfft. All working arrays are allocated up front and reused,
+    so steady-state processing does not allocate per buffer (on NumPy
+    2.x, which lets rfft write into an existing array).
+    """
+
+    def __init__(self, fft_size=None, hop_size=None, min_db=-90.0):
+        self.fft_size = fft_size or Config.SPECTRUM_FFT_SIZE
+        self.hop_size = hop_size or Config.SPECTRUM_HOP_SIZE
+        self.min_db = min_db
+        self.sample_rate = Config.SPECTRUM_SAMPLE_RATE
+        self.channel_count = 1
+
+        self._window = np.hanning(self.fft_size).astype(np.float64)
+        # Full-scale sine -> 0 dB: undo the window's coherent gain and the one-sided fold
+        self._magnitude_scale = 2.0 / self._window.sum()
+        self._ring = np.zeros(2 * self.fft_size, dtype=np.float64)
+        self._frame = np.zeros(self.fft_size, dtype=np.float64)
+        self._spectrum = np.zeros(self.fft_size // 2 + 1, dtype=np.complex128)
+        self.spectrum_db = np.full(self.fft_size // 2 + 1, self.min_db, dtype=np.float64)
+        self._mix = np.zeros(4096, dtype=np.float64)
+        self._rfft_out = self._rfft_supports_out()
+        self.reset()
+
+    def _rfft_supports_out(self):
+        try:
+            np.fft.rfft(self._frame, out=self._spectrum)
+            return True
+        except TypeError:
+            return False
+
+    def reset(self):
+        """Forget buffered audio, e.g. when the track or stream format changes"""
+        self._ring.fill(0)
+        self._written = 0  # Total samples appended
+        self._next_frame = self.fft_size  # Sample count at which the next frame is complete
+
+    def configure(self, sample_rate, channel_count):
+        """Adopt a stream format; a change restarts the ring buffer"""
+        if sample_rate != self.sample_rate or channel_count != self.channel_count:
+            self.sample_rate = sample_rate
+            self.channel_count = max(1, channel_count)
+            self.reset()
+
+    @staticmethod
+    def _sample_range(dtype):
+        """(offset, scale) that map raw samples of dtype to -1.0..1.0"""
+        if dtype.kind == 'f':
+            return 0.0, 1.0
+        info = np.iinfo(dtype)
+        if dtype.kind == 'u':
+            half = (int(info.max) + 1) / 2
+            return half, 1.0 / half
+        return 0.0, 1.0 / (int(info.max) + 1)
+
+    def _downmix(self, samples):
+        """Mix interleaved samples to mono floats in the reused scratch array"""
+        channels = self.channel_count
+        frames = len(samples) // channels
+        if frames > len(self._mix):
+            self._mix = np.zeros(frames * 2, dtype=np.float64)
+        mix = self._mix[:frames]
+        if channels == 1:
+            mix[:] = samples[:frames]
+        else:
+            np.sum(samples[:frames * channels].reshape(frames, channels), axis=1, out=mix)
+        offset, scale = self._sample_range(samples.dtype)
+        if offset:
+            mix -= offset * channels
+        mix *= scale / channels
+        return mix
+
+    def _append(self, mono):
+        ring_size = len(self._ring)
+        if len(mono) > ring_size:
+            # Only the newest ring_size samples can ever be analysed
+            self._written += len(mono) - ring_size
+            mono = mono[-ring_size:]
+        start = self._written % ring_size
+        first = min(len(mono), ring_size - start)
+        self._ring[start:start + first] = mono[:first]
+        self._ring[:len(mono) - first] = mono[first:]
+        self._written += len(mono)
+
+    def process(self, samples, channel_count=None, sample_rate=None):
+        """Feed one interleaved PCM buffer; returns the newest dB spectrum or None.
+
+        When a buffer completes several hops only the most recent frame is
+        analysed, since only the newest spectrum is shown. The returned
+        array is reused by the next call.
+        """
+        if channel_count or sample_rate:
+            self.configure(sample_rate or self.sample_rate, channel_count or self.channel_count)
+        if len(samples) < self.channel_count:
+            return None
+        self._append(self._downmix(samples))
+        if self._written < self._next_frame:
+            return None
+
+        # Latest hop boundary that is complete
+        hops = (self._written - self._next_frame) // self.hop_size
+        frame_end = self._next_frame + hops * self.hop_size
+        self._next_frame = frame_end + self.hop_size
+        return self._analyse(frame_end)
+
+    def _analyse(self, frame_end):
+        ring_size = len(self._ring)
+        start = (frame_end - self.fft_size) % ring_size
+        first = min(self.fft_size, ring_size - start)
+        self._frame[:first] = self._ring[start:start + first]
+        self._frame[first:] = self._ring[:self.fft_size - first]
+        self._frame *= self._window
+
+        if self._rfft_out:
+            np.fft.rfft(self._frame, out=self._spectrum)
+        else:
+            self._spectrum[:] = np.fft.rfft(self._frame)
+
+        db = self.spectrum_db
+        np.abs(self._spectrum, out=db)
+        db *= self._magnitude_scale
+        np.maximum(db, 10 ** (self.min_db / 20), out=db)
+        np.log10(db, out=db)
+        db *= 20
+        return db
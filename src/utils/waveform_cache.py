@@ -0,0 +1,166 @@
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from ..config import Config
+
+class WaveformCache:
+    """Content-addressed on-disk cache of downsampled waveform envelopes.
+
+    Entries are keyed on the source file's path, size and mtime and on the
+    envelope resolution, so an edited file or a changed resolution simply
+    misses and the stale entry ages out through the LRU eviction.
+    """
+    MAGIC = b'WFC1'
+    HEADER = struct.Struct('<4sII')  # magic, points, columns
+    SUFFIX = '.wfc'
+
+    def __init__(self, cache_dir=None, max_bytes=None, points=None):
+        self.cache_dir = Path(cache_dir or Config.WAVEFORM_CACHE_DIR)
+        self.points = points or Config.WAVEFORM_RESOLUTION
+        self.max_bytes = max_bytes if max_bytes is not None else Config.WAVEFORM_CACHE_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Key -> entry size in bytes, least recently used first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the LRU order from the entries already on disk"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(self.SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, entry.name[:-len(self.SUFFIX)], stat.st_size))
+        except OSError as e:
+            print(f"Error loading waveform cache: {str(e)}")
+            return
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(file_path, points=Config.WAVEFORM_RESOLUTION):
+        """Build the cache key for a media file, or None if it cannot be stat'ed"""
+        try:
+            path = os.path.abspath(file_path)
+            stat = os.stat(path)
+        except OSError:
+            return None
+        fingerprint = f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0{points}"
+        return hashlib.sha1(fingerprint.encode('utf-8', 'surrogateescape')).hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def get(self, file_path):
+        """Return the cached envelope for a media file, or None on a miss"""
+        key = self.make_key(file_path, self.points)
+        envelope = self._read(key) if key else None
+
+        with self._lock:
+            if envelope is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+        # Bump the mtime so the LRU order survives a restart
+        try:
+            os.utime(self._entry_path(key))
+        except OSError:
+            pass
+        return envelope
+
+    def put(self, file_path, envelope):
+        """Store an envelope (points x columns array) for a media file"""
+        key = self.make_key(file_path, self.points)
+        if key is None:
+            return
+
+        envelope = np.asarray(envelope, dtype=np.float32)
+        if envelope.ndim == 1:
+            envelope = envelope[:, np.newaxis]
+        points, columns = envelope.shape
+        data = self.HEADER.pack(self.MAGIC, points, columns) + envelope.astype('<f2').tobytes()
+
+        # Write to a temp file first so readers never see a partial entry
+        entry_path = self._entry_path(key)
+        temp_path = entry_path.with_name(f"{key}.{threading.get_ident()}.tmp")
+        try:
+            temp_path.write_bytes(data)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            print(f"Error writing waveform cache entry: {str(e)}")
+            return
+
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def get_or_compute(self, file_path, compute):
+        """Return the cached envelope, calling compute(file_path) on a miss"""
+        envelope = self.get(file_path)
+        if envelope is None:
+            envelope = compute(file_path)
+            if envelope is not None:
+                self.put(file_path, envelope)
+        return envelope
+
+    def _read(self, key):
+        try:
+            data = self._entry_path(key).read_bytes()
+        except OSError:
+            return None
+
+        if len(data) < self.HEADER.size:
+            return None
+        magic, points, columns = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or len(data) != self.HEADER.size + points * columns * 2:
+            return None
+        envelope = np.frombuffer(data, dtype='<f2', offset=self.HEADER.size)
+        return envelope.reshape(points, columns).astype(np.float32)
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its size cap"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._entry_path(key).unlink()
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for key in self._entries:
+                try:
+                    self._entry_path(key).unlink()
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self):
+        """Get hit/miss counters and current cache size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'size_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
@@ -0,0 +1,78 @@
+import numpy as np
+from PyQt5.QtGui import QImage, QPainter, QColor
+from PyQt5.QtCore import Qt, QLineF
+
+class WaveformRenderer:
+    """Paints min/max waveform envelopes straight into an in-memory QImage.
+
+    Only QImage and QPainter are used, so rendering is safe to run from
+    worker threads; convert to a QPixmap on the GUI thread.
+    """
+    DEFAULT_COLOR = QColor(74, 144, 226)
+    RMS_COLOR = QColor(144, 190, 240)
+
+    @staticmethod
+    def resample_envelope(envelope, width):
+        """Reduce or stretch an envelope to exactly one row per column.
+
+        Returns (mins, maxs, rms); rms is None for envelopes without an RMS column.
+        """
+        envelope = np.asarray(envelope, dtype=np.float32)
+        points = len(envelope)
+        has_rms = envelope.shape[1] >= 3
+        rms = None
+        if points >= width:
+            # Several envelope points per column: keep the extremes of each group
+            edges = np.linspace(0, points, width + 1).astype(np.int64)[:-1]
+            mins = np.minimum.reduceat(envelope[:, 0], edges)
+            maxs = np.maximum.reduceat(envelope[:, 1], edges)
+            if has_rms:
+                counts = np.diff(np.append(edges, points))
+                rms = np.sqrt(np.add.reduceat(np.square(envelope[:, 2]), edges) / counts)
+        else:
+            # Fewer points than columns: repeat the nearest point
+            index = (np.arange(width) * points // width).astype(np.int64)
+            mins = envelope[index, 0]
+            maxs = envelope[index, 1]
+            if has_rms:
+                rms = envelope[index, 2]
+        return mins, maxs, rms
+
+    @staticmethod
+    def render(envelope, width, height, color=None, background=Qt.transparent):
+        """Render a min/max (optionally RMS) envelope into a width x height QImage"""
+        width = max(int(width), 1)
+        height = max(int(height), 1)
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        image.fill(background)
+
+        if envelope is None or len(envelope) == 0:
+            return image
+
+        mins, maxs, rms = WaveformRenderer.resample_envelope(envelope, width)
+
+        # Map sample values in [-1, 1] to pixel rows, keeping at least one pixel per column
+        mid = height / 2.0
+        top = mid - np.clip(maxs, -1.0, 1.0) * mid
+        bottom = mid - np.clip(mins, -1.0, 1.0) * mid
+        bottom = np.maximum(bottom, top + 1.0)
+
+        painter = QPainter(image)
+        WaveformRenderer._draw_columns(painter, color or WaveformRenderer.DEFAULT_COLOR, top, bottom)
+
+        # Overlay the RMS body of the signal inside the peak outline
+        if rms is not None:
+            rms = np.clip(rms, 0.0, 1.0) * mid
+            WaveformRenderer._draw_columns(painter, WaveformRenderer.RMS_COLOR,
+                                           np.maximum(mid - rms, top), np.minimum(mid + rms, bottom))
+        painter.end()
+
+        return image
+
+    @staticmethod
+    def _draw_columns(painter, color, top, bottom):
+        painter.setPen(color)
+        painter.drawLines([
+            QLineF(x + 0.5, y0, x + 0.5, y1)
+            for x, (y0, y1) in enumerate(zip(top.tolist(), bottom.tolist()))
+        ])
@@ -0,0 +1,162 @@
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database.migrations import migrate
+from src.database.models import Media
+from src.utils import library_watcher
+from src.utils.library_watcher import LibraryWatcher
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'media_library.db'}")
+    migrate(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(library_watcher, 'SessionLocal', factory)
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / 'library'
+    root.mkdir()
+    return root
+
+def write_file(path, content=b'0' * 16):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+def add_rows(session_factory, *paths, **values):
+    db = session_factory()
+    for path in paths:
+        db.add(Media(file_path=str(path), title=os.path.basename(path), is_missing=False, **values))
+    db.commit()
+    db.close()
+
+def rows(session_factory):
+    """{file_path: (play_count, is_missing)} of every Media row"""
+    db = session_factory()
+    try:
+        return {path: (play_count, bool(is_missing))
+                for path, play_count, is_missing in db.query(Media.file_path, Media.play_count, Media.is_missing)}
+    finally:
+        db.close()
+
+def apply_pending(watcher):
+    with watcher._condition:
+        batch = watcher._take_batch()
+    return watcher._apply_batch(batch)
+
+def test_modify_then_rename_moves_the_known_row(session_factory, library):
+    src, dest = str(library / 'song.mp3'), str(library / 'renamed.mp3')
+    write_file(src)
+    add_rows(session_factory, src, play_count=5)
+
+    watcher = LibraryWatcher(roots=[str(library)])
+    # A tag editor saves the file, then renames it, within one quiet window
+    write_file(src, b'1' * 16)
+    watcher.queue_upsert(src, False)
+    os.rename(src, dest)
+    watcher.queue_move(src, dest, False)
+
+    summary = apply_pending(watcher)
+    assert summary['moved'] == 1 and summary['added'] == 0
+    assert rows(session_factory) == {dest: (5, False)}
+
+def test_directory_prefix_is_case_sensitive(session_factory, library):
+    upper, lower = str(library / 'Music' / 'a.mp3'), str(library / 'music' / 'a.mp3')
+    add_rows(session_factory, upper, lower, play_count=0)
+
+    watcher = LibraryWatcher(roots=[str(library)])
+    watcher.queue_delete(str(library / 'Music'), True)
+    watcher.queue_move(str(library / 'music'), str(library / 'songs'), True)
+
+    apply_pending(watcher)
+    assert rows(session_factory) == {upper: (0, True), str(library / 'songs' / 'a.mp3'): (0, False)}
+
+def test_create_then_move_is_a_single_insert(session_factory, library):
+    created, final = str(library / 'download.mp3'), str(library / 'album' / 'track.mp3')
+    watcher = LibraryWatcher(roots=[str(library)])
+    write_file(created)
+    watcher.queue_upsert(created, False, created=True)
+    write_file(final)
+    os.remove(created)
+    watcher.queue_move(created, final, False)
+
+    assert watcher._files == {final: LibraryWatcher.UPSERT}
+    assert watcher._moves == []
+    summary = apply_pending(watcher)
+    assert summary['added'] == 1 and summary['moved'] == 0
+    assert rows(session_factory) == {final: (0, False)}
+
+def test_last_event_per_path_wins(session_factory, library):
+    path = str(library / 'song.mp3')
+    watcher = LibraryWatcher(roots=[str(library)])
+    watcher.queue_upsert(path, False, created=True)
+    watcher.queue_delete(path, False)
+    watcher.queue_upsert(str(library / 'notes.txt'), False)
+
+    assert watcher._files == {path: LibraryWatcher.DELETE}
+    assert watcher._created == set()
+
+def test_directory_move_carries_pending_work(session_factory, library):
+    watcher = LibraryWatcher(roots=[str(library)])
+    watcher.queue_upsert(str(library / 'a' / 'new.mp3'), False, created=True)
+    watcher.queue_upsert(str(library / 'a' / 'sub'), True)
+    watcher.queue_move(str(library / 'a'), str(library / 'b'), True)
+
+    assert watcher._files == {str(library / 'b' / 'new.mp3'): LibraryWatcher.UPSERT}
+    assert watcher._created == {str(library / 'b' / 'new.mp3')}
+    assert watcher._scan_dirs == {str(library / 'b' / 'sub')}
+    assert watcher._moves == [(str(library / 'a'), str(library / 'b'), True)]
+
+def test_directory_move_onto_existing_rows(session_factory, library):
+    add_rows(session_factory, library / 'a' / '1.mp3', play_count=1)
+    add_rows(session_factory, library / 'a' / '2.mp3', play_count=2)
+    add_rows(session_factory, library / 'b' / '1.mp3', play_count=3)
+    # a/ was merged into b/, replacing b/1.mp3
+    write_file(str(library / 'b' / '1.mp3'))
+    write_file(str(library / 'b' / '2.mp3'))
+
+    watcher = LibraryWatcher(roots=[str(library)])
+    watcher.queue_move(str(library / 'a'), str(library / 'b'), True)
+    summary = apply_pending(watcher)
+
+    assert summary['moved'] == 1
+    assert rows(session_factory) == {
+        str(library / 'a' / '1.mp3'): (1, True),
+        str(library / 'b' / '1.mp3'): (3, False),
+        str(library / 'b' / '2.mp3'): (2, False),
+    }
+
+def test_deleted_directory_marks_rows_below_it_missing(session_factory, library):
+    add_rows(session_factory, library / 'old' / 'x.mp3', library / 'old' / 'sub' / 'y.mp3',
+             library / 'older' / 'z.mp3', play_count=0)
+
+    watcher = LibraryWatcher(roots=[str(library)])
+    watcher.queue_upsert(str(library / 'old' / 'sub'), True)
+    watcher.queue_delete(str(library / 'old'), True)
+    summary = apply_pending(watcher)
+
+    assert summary['missing'] == 2
+    assert rows(session_factory) == {
+        str(library / 'old' / 'x.mp3'): (0, True),
+        str(library / 'old' / 'sub' / 'y.mp3'): (0, True),
+        str(library / 'older' / 'z.mp3'): (0, False),
+    }
+
+def test_failed_batch_is_requeued_behind_newer_events(session_factory, library):
+    first, second = str(library / 'a.mp3'), str(library / 'b.mp3')
+    watcher = LibraryWatcher(roots=[str(library)])
+    watcher.queue_upsert(first, False)
+    watcher.queue_upsert(second, False)
+    watcher.queue_move(str(library / 'c.mp3'), str(library / 'd.mp3'), False)
+    with watcher._condition:
+        batch = watcher._take_batch()
+    watcher.queue_delete(second, False)
+
+    watcher._requeue(batch)
+    assert watcher._files == {first: LibraryWatcher.UPSERT, second: LibraryWatcher.DELETE}
+    assert watcher._moves == [(str(library / 'c.mp3'), str(library / 'd.mp3'), False)]
+    assert watcher._first_event is not None
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import create_engine, text
+from src.database.migrations import migrate, latest_version, check_query_plans
+
+# Media and playlist tables as they were before the first migration
+LEGACY_SCHEMA = (
+    """CREATE TABLE media (
+        id INTEGER PRIMARY KEY, title VARCHAR, file_path VARCHAR UNIQUE, media_type VARCHAR,
+        duration FLOAT, created_date DATETIME, last_played DATETIME, play_count INTEGER,
+        rating INTEGER, artist VARCHAR, album VARCHAR, is_favorite BOOLEAN,
+        total_play_time FLOAT, comment VARCHAR
+    )""",
+    "CREATE TABLE playlists (id INTEGER PRIMARY KEY, name VARCHAR UNIQUE)",
+    """CREATE TABLE playlist_items (
+        id INTEGER PRIMARY KEY, playlist_id INTEGER REFERENCES playlists (id),
+        media_id INTEGER REFERENCES media (id), position INTEGER
+    )""",
+)
+
+@pytest.fixture
+def db_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'media_library.db'}")
+    yield engine
+    engine.dispose()
+
+def test_fresh_database_uses_indexes(db_engine):
+    assert migrate(db_engine) == latest_version()
+    assert check_query_plans(db_engine) == {}
+
+def test_migrated_legacy_database_uses_indexes(db_engine):
+    with db_engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+        # Migration 1 runs ANALYZE, so the rows should look like a real library: few favorites or ratings
+        connection.execute(text(
+            "INSERT INTO media (title, file_path, play_count, rating, is_favorite) "
+            "VALUES (:title, :file_path, :play_count, :rating, :is_favorite)"
+        ), [
+            {'title': f"Track {n}", 'file_path': f"/music/{n}.mp3", 'play_count': n % 7,
+             'rating': 4 if n % 50 == 0 else None, 'is_favorite': n % 100 == 0}
+            for n in range(1000)
+        ])
+
+    assert migrate(db_engine) == latest_version()
+    assert check_query_plans(db_engine) == {}
+    with db_engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM media WHERE NOT is_missing")).scalar() == 1000
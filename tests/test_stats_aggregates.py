@@ -0,0 +1,65 @@
+import pytest
+from PyQt5.QtCore import QCoreApplication
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import stats_aggregates, stats_writer
+from src.database.migrations import migrate
+from src.database.models import Media
+from src.database.stats_aggregates import StatsAggregateStore
+from src.database.stats_writer import StatsWriteQueue
+
+@pytest.fixture(scope='module')
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'media_library.db'}")
+    migrate(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(stats_writer, 'SessionLocal', factory)
+    monkeypatch.setattr(stats_aggregates, 'get_read_session', factory)
+    db = factory()
+    db.add_all([Media(file_path='/music/a.mp3', title='A', play_count=1),
+                Media(file_path='/music/b.mp3', title='B', play_count=4)])
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def store(app, session_factory):
+    writer = StatsWriteQueue()
+    store = StatsAggregateStore(top_n=2, writer=writer)
+    store.reload()
+    writer.stats_queued.connect(store.apply)
+    return store
+
+def play_counts(session_factory):
+    db = session_factory()
+    try:
+        return dict(db.query(Media.file_path, Media.play_count))
+    finally:
+        db.close()
+
+def test_reload_keeps_queued_changes(store, session_factory):
+    for _ in range(5):
+        store.writer.record_play('/music/a.mp3')
+    assert store.most_played() == [('A', 6), ('B', 4)]
+
+    store.reload()
+    assert store.most_played() == [('A', 6), ('B', 4)]
+    assert play_counts(session_factory) == {'/music/a.mp3': 6, '/music/b.mp3': 4}
+
+def test_reload_reapplies_changes_a_failed_flush_kept(store, session_factory, monkeypatch):
+    def fail(pending, events):
+        raise RuntimeError("database is locked")
+    monkeypatch.setattr(store.writer, '_write', fail)
+    for _ in range(5):
+        store.writer.record_play('/music/a.mp3')
+    store.writer.set_favorite('/music/b.mp3', True)
+
+    store.reload()
+    assert store.most_played() == [('A', 6), ('B', 4)]
+    assert store.favorites() == ['B']
+    assert store.writer.pending_count() == 2
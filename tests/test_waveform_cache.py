@@ -0,0 +1,19 @@
+import numpy as np
+from src.utils.waveform_cache import WaveformCache
+
+def test_entries_are_keyed_on_resolution(tmp_path):
+    media = tmp_path / 'track.wav'
+    media.write_bytes(b'audio')
+    cache_dir = tmp_path / 'cache'
+
+    coarse = WaveformCache(cache_dir, points=1000)
+    coarse.put(media, np.zeros((1000, 3), dtype=np.float32))
+    assert coarse.get(media).shape == (1000, 3)
+
+    # An envelope cached at another resolution is a miss, not a stretched reuse
+    fine = WaveformCache(cache_dir, points=4096)
+    assert fine.get(media) is None
+    envelope = fine.get_or_compute(media, lambda path: np.ones((4096, 3), dtype=np.float32))
+    assert envelope.shape == (4096, 3)
+    assert fine.get(media).shape == (4096, 3)
+    assert coarse.get(media).shape == (1000, 3)